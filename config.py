@@ -52,6 +52,12 @@ DOCUMENT_TABLE_DIV_LOCATOR = (By.XPATH, ".//div[@class='wj-row' and @role='row']
 DOCUMENT_ROW_FIRST_CELL_LOCATOR= (By.XPATH, ".//div[contains(@class, 'wj-cell') and contains(@class, 'wj-frozen') and contains(@class, 'wj-frozen-col')]")
 
 DOCUMENT_DATA_CELL_LOCATOR= (By.XPATH, ".//div[contains(@class, 'wj-cell') and @role='gridcell']")
+
+# CSS equivalents of the row/cell locators above, used by execute_script to scrape a whole page in one call
+DOCUMENT_TABLE_CSS = "div[class='wj-cells'][wj-part='cells']"
+DOCUMENT_TABLE_ROW_CSS = "div[class='wj-row'][role='row']"
+DOCUMENT_DATA_CELL_CSS = "div.wj-cell[role='gridcell']"
+DOCUMENT_ID_CELL_INDEX = 9
 NEXT_PAGE_BTN_LOCATOR= (By.XPATH, ".//div[contains(@class, 'paginate-button') and contains(@class, 'next')]")
 
 # Locator for Notes button (located in document viewer iframe)
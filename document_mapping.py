@@ -13,10 +13,12 @@ Categories:
 """
 
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
 def get_document_category(file_section, document_type, description):
     """
     Xác định thư mục category dựa trên File Section, Document Type và Description
@@ -4,6 +4,7 @@ Handles all Excel file operations
 """
 
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -50,10 +51,19 @@ class ExcelHandler:
         # List attributes
         self.client_list = []
         self.document_list = []
+        # (client_name, client_number, doc_id) -> row_index, kept in sync with document_list
+        self._document_index = {}
+        # row_index -> doc_info (same dicts as in document_list)
+        self._document_info_by_row = {}
+        # Header column indices are read once; the header rows do not change while running
+        self._client_header_indices = None
+        self._document_header_indices = None
+        self._document_header_width = 0
         
         # Read lists on initialization
         self.client_list = self.get_client_list()
         self.document_list = self.get_document_list()
+        self.build_document_index()
     
     def get_client_header_indices(self):
         """
@@ -66,6 +76,9 @@ class ExcelHandler:
             ExcelHeaderError: If required columns not found in header
             ExcelOperationError: If there is an error reading header
         """
+        if self._client_header_indices is not None:
+            return self._client_header_indices
+        
         try:
             header_row = [cell.value for cell in self.client_list_sheet[1]]
             
@@ -85,6 +98,7 @@ class ExcelHandler:
             except ValueError:
                 indices['client_email'] = None
             
+            self._client_header_indices = indices
             return indices
             
         except ValueError as e:
@@ -105,6 +119,9 @@ class ExcelHandler:
             ExcelHeaderError: If required columns not found in header
             ExcelOperationError: If there is an error reading header
         """
+        if self._document_header_indices is not None:
+            return self._document_header_indices
+        
         try:
             header_row = [cell.value for cell in self.document_list_sheet[1]]
             
@@ -127,6 +144,8 @@ class ExcelHandler:
                 'download_time': header_row.index('Download time')
             }
             
+            self._document_header_indices = indices
+            self._document_header_width = len(header_row)
             return indices
             
         except ValueError as e:
@@ -144,7 +163,7 @@ class ExcelHandler:
             status_filter (str): Filter clients by status (default: None - get all)
         
         Returns:
-            list: Client list, each item is a dict containing client info and cell references
+            list: Client list, each item is a dict containing client info (row_index, client_name, client_number)
             
         Raises:
             ExcelHeaderError: If header cannot be read
@@ -154,36 +173,30 @@ class ExcelHandler:
             indices = self.get_client_header_indices()
             
             client_list = []
-            for row_idx, row in enumerate(self.client_list_sheet.iter_rows(min_row=2, values_only=False), start=2):
+            # values_only: stream plain values, no Cell references are kept per client
+            for row_idx, row in enumerate(self.client_list_sheet.iter_rows(min_row=2, values_only=True), start=2):
                 try:
-                    client_name = str(row[indices['client_name']].value or "").strip()
-                    client_number = str(row[indices['client_number']].value or "").strip()
+                    client_name = str(row[indices['client_name']] or "").strip()
+                    client_number = str(row[indices['client_number']] or "").strip()
                     
                     if not client_name or not client_number:
                         continue
                     
                     # Filter by status if status_filter is provided
                     if status_filter is not None:
-                        status_value = str(row[indices['status']].value or "").strip()
+                        status_value = str(row[indices['status']] or "").strip()
                         if status_value != status_filter:
                             continue
                     
                     client_info = {
                         'row_index': row_idx,
-                        'status_cell': row[indices['status']],
-                        'description_cell': row[indices['description']],
-                        'client_name_cell': row[indices['client_name']],
-                        'client_number_cell': row[indices['client_number']],
-                        'total_documents_cell': row[indices['total_documents']],
-                        'num_files_downloaded_cell': row[indices['num_files_downloaded']],
-                        'client_folder_path_cell': row[indices['client_folder_path']],
                         'client_name': client_name,
                         'client_number': client_number,
                     }
                     
                     # Add client_email if exists
                     if indices.get('client_email') is not None:
-                        client_info['client_email_cell'] = row[indices['client_email']]
+                        client_info['client_email'] = str(row[indices['client_email']] or "").strip()
                     
                     client_list.append(client_info)
                 except Exception as e:
@@ -217,11 +230,12 @@ class ExcelHandler:
             indices = self.get_document_header_indices()
             
             document_list = []
-            for row_idx, row in enumerate(self.document_list_sheet.iter_rows(min_row=2, values_only=False), start=2):
+            # values_only: stream plain values instead of building Cell tuples
+            for row_idx, row in enumerate(self.document_list_sheet.iter_rows(min_row=2, values_only=True), start=2):
                 try:
-                    doc_id = str(row[indices['doc_id']].value or "").strip()
-                    client_name = str(row[indices['client_name']].value or "").strip()
-                    client_number = str(row[indices['client_number']].value or "").strip()
+                    doc_id = str(row[indices['doc_id']] or "").strip()
+                    client_name = str(row[indices['client_name']] or "").strip()
+                    client_number = str(row[indices['client_number']] or "").strip()
                     
                     if not doc_id or not client_name or not client_number:
                         continue
@@ -231,19 +245,19 @@ class ExcelHandler:
                         'doc_id': doc_id,
                         'client_name': client_name,
                         'client_number': client_number,
-                        'download_status': str(row[indices['download_status']].value or "").strip(),
-                        'download_desc': str(row[indices['download_desc']].value or "").strip(),
-                        'file_name': str(row[indices['file_name']].value or "").strip(),
-                        'file_path': str(row[indices['file_path']].value or "").strip(),
-                        'folder_category': str(row[indices['folder_category']].value or "").strip(),
-                        'file_section': str(row[indices['file_section']].value or "").strip(),
-                        'doc_type': str(row[indices['doc_type']].value or "").strip(),
-                        'description': str(row[indices['description']].value or "").strip(),
-                        'year': str(row[indices['year']].value or "").strip(),
-                        'doc_date': str(row[indices['doc_date']].value or "").strip(),
-                        'file_size': str(row[indices['file_size']].value or "").strip(),
-                        'file_type': str(row[indices['file_type']].value or "").strip(),
-                        'download_time': str(row[indices['download_time']].value or "").strip(),
+                        'download_status': str(row[indices['download_status']] or "").strip(),
+                        'download_desc': str(row[indices['download_desc']] or "").strip(),
+                        'file_name': str(row[indices['file_name']] or "").strip(),
+                        'file_path': str(row[indices['file_path']] or "").strip(),
+                        'folder_category': str(row[indices['folder_category']] or "").strip(),
+                        'file_section': str(row[indices['file_section']] or "").strip(),
+                        'doc_type': str(row[indices['doc_type']] or "").strip(),
+                        'description': str(row[indices['description']] or "").strip(),
+                        'year': str(row[indices['year']] or "").strip(),
+                        'doc_date': str(row[indices['doc_date']] or "").strip(),
+                        'file_size': str(row[indices['file_size']] or "").strip(),
+                        'file_type': str(row[indices['file_type']] or "").strip(),
+                        'download_time': str(row[indices['download_time']] or "").strip(),
                     }
                     
                     document_list.append(doc_info)
@@ -277,6 +291,18 @@ class ExcelHandler:
                 return client_info['row_index']
         return None
     
+    def build_document_index(self):
+        """
+        Build lookup dict from document_list so get_document_row_index is O(1)
+        (first row wins when a document appears more than once)
+        """
+        self._document_index = {}
+        self._document_info_by_row = {}
+        for doc_info in self.document_list:
+            key = (doc_info['client_name'], doc_info['client_number'], doc_info['doc_id'])
+            self._document_index.setdefault(key, doc_info['row_index'])
+            self._document_info_by_row.setdefault(doc_info['row_index'], doc_info)
+    
     def get_document_row_index(self, client_name, client_number, document_id):
         """
         Find row_index of document in document_list_sheet
@@ -289,12 +315,7 @@ class ExcelHandler:
         Returns:
             int: Row index if found, None if not found
         """
-        for doc_info in self.document_list:
-            if (doc_info['client_name'] == client_name and 
-                doc_info['client_number'] == client_number and
-                doc_info['doc_id'] == document_id):
-                return doc_info['row_index']
-        return None
+        return self._document_index.get((client_name, client_number, document_id))
     
     def update_client_row(self, row_index, status=None, description=None, 
                          total_documents=None, num_files_downloaded=None, 
@@ -317,33 +338,19 @@ class ExcelHandler:
         try:
             indices = self.get_client_header_indices()
             
-            row = self.client_list_sheet[row_index]
+            sheet = self.client_list_sheet
             
+            # Write only the target cells (indexing the sheet by row builds every cell of the row)
             if status is not None:
-                row[indices['status']].value = status
+                sheet.cell(row=row_index, column=indices['status'] + 1, value=status)
             if description is not None:
-                row[indices['description']].value = description
+                sheet.cell(row=row_index, column=indices['description'] + 1, value=description)
             if total_documents is not None:
-                row[indices['total_documents']].value = str(total_documents)
+                sheet.cell(row=row_index, column=indices['total_documents'] + 1, value=str(total_documents))
             if num_files_downloaded is not None:
-                row[indices['num_files_downloaded']].value = str(num_files_downloaded)
+                sheet.cell(row=row_index, column=indices['num_files_downloaded'] + 1, value=str(num_files_downloaded))
             if client_folder_path is not None:
-                row[indices['client_folder_path']].value = client_folder_path
-            
-            # Update in client_list
-            for client_info in self.client_list:
-                if client_info['row_index'] == row_index:
-                    if status is not None:
-                        client_info['status_cell'].value = status
-                    if description is not None:
-                        client_info['description_cell'].value = description
-                    if total_documents is not None:
-                        client_info['total_documents_cell'].value = str(total_documents)
-                    if num_files_downloaded is not None:
-                        client_info['num_files_downloaded_cell'].value = str(num_files_downloaded)
-                    if client_folder_path is not None:
-                        client_info['client_folder_path_cell'].value = client_folder_path
-                    break
+                sheet.cell(row=row_index, column=indices['client_folder_path'] + 1, value=client_folder_path)
             
         except (ExcelHeaderError, ExcelOperationError):
             raise
@@ -376,38 +383,24 @@ class ExcelHandler:
         
         try:
             indices = self.get_document_header_indices()
+            values = {
+                'download_status': download_status,
+                'download_desc': download_desc,
+                'file_name': file_name,
+                'file_path': file_path,
+                'folder_category': folder_category,
+                'download_time': download_time,
+            }
             
-            row = self.document_list_sheet[row_index]
-            
-            if download_status is not None:
-                row[indices['download_status']].value = download_status
-            if download_desc is not None:
-                row[indices['download_desc']].value = download_desc
-            if file_name is not None:
-                row[indices['file_name']].value = file_name
-            if file_path is not None:
-                row[indices['file_path']].value = file_path
-            if folder_category is not None:
-                row[indices['folder_category']].value = folder_category
-            if download_time is not None:
-                row[indices['download_time']].value = download_time
-            
-            # Update in document_list
-            for doc_info in self.document_list:
-                if doc_info['row_index'] == row_index:
-                    if download_status is not None:
-                        doc_info['download_status'] = download_status
-                    if download_desc is not None:
-                        doc_info['download_desc'] = download_desc
-                    if file_name is not None:
-                        doc_info['file_name'] = file_name
-                    if file_path is not None:
-                        doc_info['file_path'] = file_path
-                    if folder_category is not None:
-                        doc_info['folder_category'] = folder_category
-                    if download_time is not None:
-                        doc_info['download_time'] = download_time
-                    break
+            # Update in sheet (write single cells instead of materializing the whole row)
+            # and in document_list (row_index -> doc_info lookup instead of scanning the list)
+            doc_info = self._document_info_by_row.get(row_index)
+            for field_name, value in values.items():
+                if value is None:
+                    continue
+                self.document_list_sheet.cell(row=row_index, column=indices[field_name] + 1, value=value)
+                if doc_info is not None:
+                    doc_info[field_name] = value
             
         except (ExcelHeaderError, ExcelOperationError):
             raise
@@ -415,6 +408,23 @@ class ExcelHandler:
             error_msg = f"Error updating document row {row_index}: {str(e)}"
             raise ExcelOperationError(error_msg) from e
     
+    def bulk_update_document_rows(self, updates):
+        """
+        Update many rows in document_list_sheet in one call (workbook is saved by the caller once per client)
+        
+        Args:
+            updates (list): List of dicts with key row_index and optional keys download_status,
+                download_desc, file_name, file_path, folder_category, download_time
+            
+        Raises:
+            ExcelHeaderError: If header cannot be read
+            ExcelOperationError: If there is an error updating a document row
+        """
+        for update in updates:
+            fields = dict(update)
+            row_index = fields.pop('row_index')
+            self.update_document_row(row_index, **fields)
+    
     def add_document_row(self, document_id, client_name, client_number,
                         file_name="", file_section="", document_type="",
                         description="", year="", document_date="",
@@ -469,43 +479,11 @@ class ExcelHandler:
                 return existing_row_index
             else:
                 # Not exists, add new
-                indices = self.get_document_header_indices()
-                
-                # Create new row
-                header_row = [cell.value for cell in self.document_list_sheet[1]]
-                new_row = [None] * len(header_row)
-                
-                new_row[indices['download_status']] = ""
-                new_row[indices['download_desc']] = ""
-                new_row[indices['client_name']] = client_name
-                new_row[indices['client_number']] = client_number
-                new_row[indices['file_name']] = file_name
-                new_row[indices['file_path']] = ""
-                new_row[indices['folder_category']] = folder_category
-                new_row[indices['file_section']] = file_section
-                new_row[indices['doc_type']] = document_type
-                new_row[indices['description']] = description
-                new_row[indices['year']] = year
-                new_row[indices['doc_date']] = document_date
-                new_row[indices['file_size']] = file_size
-                new_row[indices['doc_id']] = document_id
-                new_row[indices['file_type']] = file_type
-                new_row[indices['download_time']] = ""
-                
-                # Add row to sheet
-                self.document_list_sheet.append(new_row)
-                new_row_index = self.document_list_sheet.max_row
-                
-                # Add to document_list
-                doc_info = {
-                    'row_index': new_row_index,
+                return self.extend_document_rows([{
                     'doc_id': document_id,
                     'client_name': client_name,
                     'client_number': client_number,
-                    'download_status': "",
-                    'download_desc': "",
                     'file_name': file_name,
-                    'file_path': "",
                     'folder_category': folder_category,
                     'file_section': file_section,
                     'doc_type': document_type,
@@ -514,17 +492,77 @@ class ExcelHandler:
                     'doc_date': document_date,
                     'file_size': file_size,
                     'file_type': file_type,
+                }])[0]
+                
+        except (ExcelHeaderError, ExcelOperationError):
+            raise
+        except Exception as e:
+            error_msg = f"Error adding document row: {str(e)}"
+            raise ExcelOperationError(error_msg) from e
+    
+    def extend_document_rows(self, documents):
+        """
+        Append many new rows to document_list sheet in one pass
+        Caller is responsible for only passing documents that do not exist yet
+        
+        Args:
+            documents (list): List of dicts with keys doc_id, client_name, client_number and
+                optional file_name, folder_category, file_section, doc_type, description,
+                year, doc_date, file_size, file_type
+            
+        Returns:
+            list: Row indices of the appended rows, in the same order as documents
+            
+        Raises:
+            ExcelHeaderError: If header cannot be read
+            ExcelOperationError: If there is an error adding document rows
+        """
+        try:
+            indices = self.get_document_header_indices()
+            field_names = ('file_name', 'folder_category', 'file_section', 'doc_type',
+                           'description', 'year', 'doc_date', 'file_size', 'file_type')
+            
+            # max_row scans every cell, so read it once and count up from there
+            next_row_index = self.document_list_sheet.max_row + 1
+            row_indices = []
+            
+            for document in documents:
+                doc_info = {
+                    'row_index': next_row_index,
+                    'doc_id': document['doc_id'],
+                    'client_name': document['client_name'],
+                    'client_number': document['client_number'],
+                    'download_status': "",
+                    'download_desc': "",
+                    'file_path': "",
                     'download_time': "",
                 }
-                self.document_list.append(doc_info)
+                for field_name in field_names:
+                    doc_info[field_name] = document.get(field_name, "")
                 
-                logger.debug(f"Added new document row: row {new_row_index}, doc_id: {document_id}")
-                return new_row_index
+                # Create new row
+                new_row = [None] * self._document_header_width
+                for field_name, column_index in indices.items():
+                    new_row[column_index] = doc_info[field_name]
                 
+                # Add row to sheet and to document_list
+                self.document_list_sheet.append(new_row)
+                self.document_list.append(doc_info)
+                self._document_info_by_row[next_row_index] = doc_info
+                self._document_index.setdefault(
+                    (doc_info['client_name'], doc_info['client_number'], doc_info['doc_id']),
+                    next_row_index
+                )
+                row_indices.append(next_row_index)
+                next_row_index += 1
+            
+            logger.debug(f"Added {len(row_indices)} new document rows")
+            return row_indices
+            
         except (ExcelHeaderError, ExcelOperationError):
             raise
         except Exception as e:
-            error_msg = f"Error adding document row: {str(e)}"
+            error_msg = f"Error adding document rows: {str(e)}"
             raise ExcelOperationError(error_msg) from e
     
     def save_workbook(self):
@@ -544,3 +582,31 @@ class ExcelHandler:
         except Exception as e:
             error_msg = f"Error saving Excel: {str(e)}"
             raise ExcelSaveError(error_msg) from e
+
+
+class ThreadSafeExcelHandler:
+    """
+    Wrap an ExcelHandler so that method calls from several worker threads are serialized
+    (openpyxl workbooks are not thread-safe)
+    """
+    
+    def __init__(self, excel_handler):
+        """
+        Initialize ThreadSafeExcelHandler
+        
+        Args:
+            excel_handler (ExcelHandler): Handler shared by all workers
+        """
+        self._excel_handler = excel_handler
+        self._lock = threading.RLock()
+    
+    def __getattr__(self, name):
+        attribute = getattr(self._excel_handler, name)
+        if not callable(attribute):
+            return attribute
+        
+        def locked_call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+        
+        return locked_call
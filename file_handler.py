@@ -4,14 +4,44 @@ Handles all file operations after downloading from browser
 """
 
 import os
+import errno
 import shutil
 import zipfile
 import logging
 import time
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Optional: use zlib-ng (SIMD inflate/crc32) for ZIP decompression when installed
+try:
+    from zlib_ng import zlib_ng
+    zipfile.zlib = zlib_ng
+    zipfile.crc32 = zlib_ng.crc32
+    logger.debug("Using zlib-ng for ZIP decompression")
+except ImportError:
+    zlib_ng = None
+
+# Optional (Linux): inotify so download waits wake up on directory events instead of fixed polling
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# Buffer size used when streaming ZIP members to disk
+ZIP_EXTRACT_BUFFER_SIZE = 1024 * 1024
+# zlib inflates without the GIL and writes are I/O bound, so a fixed pool beats cpu_count here
+ZIP_EXTRACT_MAX_WORKERS = 8
+
+# Buffer size for cross-device moves; one buffer per thread is reused for every file
+MOVE_BUFFER_SIZE = 1024 * 1024
+_move_buffer_state = threading.local()
+
+# Polling interval (seconds) without inotify; max wait for one inotify event before rescanning
+DOWNLOAD_POLL_INTERVAL = 2
+
 
 # Custom Exceptions
 class FileHandlerError(Exception):
@@ -102,9 +132,9 @@ def move_file(source_path, destination_path):
         if dest_dir and not os.path.exists(dest_dir):
             os.makedirs(dest_dir, exist_ok=True)
         
-        # Move file
-        shutil.move(source_path, destination_path)
-        logger.info(f"Moved file: {os.path.basename(source_path)} -> {destination_path}")
+        # Move file (rename on the same filesystem, buffered copy across devices)
+        replace_or_move(source_path, destination_path)
+        logger.debug(f"Moved file: {os.path.basename(source_path)} -> {destination_path}")
         
     except FileNotFoundError:
         raise
@@ -113,6 +143,62 @@ def move_file(source_path, destination_path):
         raise FileOperationError(error_msg) from e
 
 
+def _get_move_buffer():
+    """
+    Get the 1 MiB copy buffer of the current thread (allocated once per thread, reused for every move)
+    
+    Returns:
+        memoryview: Reusable copy buffer
+    """
+    buffer = getattr(_move_buffer_state, 'buffer', None)
+    if buffer is None:
+        buffer = memoryview(bytearray(MOVE_BUFFER_SIZE))
+        _move_buffer_state.buffer = buffer
+    return buffer
+
+
+def _copy_then_remove(source_path, destination_path):
+    """
+    Move file across filesystems: copy through the reusable buffer, keep timestamps, remove source
+    
+    Args:
+        source_path (str): Source file path
+        destination_path (str): Destination file path
+        
+    Raises:
+        OSError: If the file cannot be copied or the source cannot be removed
+    """
+    buffer = _get_move_buffer()
+    with open(source_path, 'rb') as src, open(destination_path, 'wb') as dst:
+        while True:
+            read_size = src.readinto(buffer)
+            if not read_size:
+                break
+            dst.write(buffer[:read_size])
+    shutil.copystat(source_path, destination_path)
+    os.unlink(source_path)
+
+
+def replace_or_move(source_path, destination_path):
+    """
+    Move file with a single os.replace (atomic rename) when source and destination
+    are on the same filesystem, fall back to a buffered copy + remove across devices
+    
+    Args:
+        source_path (str): Source file path
+        destination_path (str): Destination file path
+        
+    Raises:
+        OSError: If the file cannot be moved
+    """
+    try:
+        os.replace(source_path, destination_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _copy_then_remove(source_path, destination_path)
+
+
 def move_csv_to_storage(csv_file_path, csv_dir):
     """
     Move CSV file to 0_csv_ directory
@@ -249,6 +335,219 @@ def extract_zip(zip_path, extract_dir):
         raise ZipFileError(error_msg) from e
 
 
+def _get_zip_member_path_parts(member_name):
+    """
+    Split ZIP member name into safe path parts, same rules as ZipFile.extract:
+    both separators ('/' and os.sep/os.altsep, so '\\' on Windows), drive letters removed,
+    empty, '.' and '..' parts dropped, characters invalid on Windows replaced
+    
+    Args:
+        member_name (str): Member name inside ZIP
+        
+    Returns:
+        list: Path parts relative to extraction directory
+    """
+    arcname = member_name.replace('/', os.sep)
+    if os.altsep:
+        arcname = arcname.replace(os.altsep, os.sep)
+    # Drop drive letter / UNC prefix ("C:x", "\\\\server\\share\\x")
+    arcname = os.path.splitdrive(arcname)[1]
+    path_parts = [part for part in arcname.split(os.sep) if part not in ('', os.curdir, os.pardir)]
+    if os.sep == '\\':
+        path_parts = [
+            part for part in (zipfile.ZipFile._sanitize_windows_name(part, os.sep) for part in path_parts)
+            if part
+        ]
+    return path_parts
+
+
+def _get_zip_member_target_path(base_dir, path_parts):
+    """
+    Join sanitized member path parts to base_dir and check the result stays inside base_dir
+    
+    Args:
+        base_dir (str): Extraction directory
+        path_parts (list): Parts from _get_zip_member_path_parts
+        
+    Returns:
+        str: Target path inside base_dir
+        
+    Raises:
+        ZipFileError: If the target path resolves outside base_dir
+    """
+    target_path = os.path.join(base_dir, *path_parts)
+    real_base_dir = os.path.realpath(base_dir)
+    real_target_path = os.path.realpath(target_path)
+    if os.path.commonpath([real_base_dir, real_target_path]) != real_base_dir:
+        error_msg = f"ZIP member path escapes extraction directory: {target_path}"
+        raise ZipFileError(error_msg)
+    return target_path
+
+
+def _extract_zip_member(zip_path, member_name, target_path, local_state, open_handles, handles_lock):
+    """
+    Stream one ZIP member to disk using the ZipFile handle of the current worker thread
+    (ZipFile objects are not safe to share between threads, so each worker opens its own once)
+    The member is copied through a fixed ZIP_EXTRACT_BUFFER_SIZE buffer so memory stays bounded
+    
+    Args:
+        zip_path (str): ZIP file path
+        member_name (str): Member name inside the ZIP
+        target_path (str): Destination file path (its directory must exist)
+        local_state (threading.local): Per-thread storage of the ZipFile handle
+        open_handles (list): All opened handles, closed by the caller after the pool finishes
+        handles_lock (threading.Lock): Lock guarding open_handles
+    """
+    zip_ref = getattr(local_state, 'zip_ref', None)
+    if zip_ref is None:
+        zip_ref = zipfile.ZipFile(zip_path, 'r')
+        local_state.zip_ref = zip_ref
+        with handles_lock:
+            open_handles.append(zip_ref)
+    with zip_ref.open(member_name) as src, open(target_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, length=ZIP_EXTRACT_BUFFER_SIZE)
+
+
+def _extract_zip_members_parallel(zip_path, members, max_workers=None):
+    """
+    Extract (member_name, target_path) pairs with a thread pool, one task per member
+    so a few large members don't leave the other workers idle
+    
+    Args:
+        zip_path (str): ZIP file path
+        members (list): (member_name, target_path) pairs, target directories must exist
+        max_workers (int): Number of worker threads (default: ZIP_EXTRACT_MAX_WORKERS)
+        
+    Returns:
+        int: Number of worker threads used
+    """
+    workers = max(1, min(max_workers or ZIP_EXTRACT_MAX_WORKERS, len(members)))
+    local_state = threading.local()
+    open_handles = []
+    handles_lock = threading.Lock()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_zip_member, zip_path, member_name, target_path,
+                                       local_state, open_handles, handles_lock)
+                       for member_name, target_path in members]
+            for future in futures:
+                future.result()
+    finally:
+        for zip_ref in open_handles:
+            zip_ref.close()
+    return workers
+
+
+def extract_zip_parallel(zip_path, extract_dir, max_workers=None):
+    """
+    Extract ZIP file to extract_dir using a thread pool
+    zlib releases the GIL while inflating, so members are decompressed concurrently
+    
+    Args:
+        zip_path (str): ZIP file path
+        extract_dir (str): Extraction directory
+        max_workers (int): Number of worker threads (default: ZIP_EXTRACT_MAX_WORKERS)
+        
+    Returns:
+        list: Paths of the extracted files (directories excluded)
+        
+    Raises:
+        FileNotFoundError: If ZIP file does not exist
+        ZipFileError: If ZIP file is corrupted or there is an error extracting
+    """
+    if not os.path.exists(zip_path):
+        error_msg = f"ZIP file does not exist: {zip_path}"
+        raise FileNotFoundError(error_msg)
+    
+    try:
+        os.makedirs(extract_dir, exist_ok=True)
+        
+        # Read member list and create sub directories up front so workers never race on makedirs
+        members = []
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    zip_ref.extract(info, extract_dir)
+                    continue
+                path_parts = _get_zip_member_path_parts(info.filename)
+                if not path_parts:
+                    continue
+                target_path = _get_zip_member_target_path(extract_dir, path_parts)
+                if len(path_parts) > 1:
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                members.append((info.filename, target_path))
+        
+        extracted_paths = [target_path for _, target_path in members]
+        if not members:
+            logger.info(f"Extracted ZIP (no files): {zip_path} to {extract_dir}")
+            return extracted_paths
+        
+        workers = _extract_zip_members_parallel(zip_path, members, max_workers)
+        
+        logger.info(f"Extracted ZIP ({len(members)} files, {workers} threads): {zip_path} to {extract_dir}")
+        return extracted_paths
+        
+    except zipfile.BadZipFile as e:
+        error_msg = f"ZIP file is corrupted: {zip_path}"
+        raise ZipFileError(error_msg) from e
+    except Exception as e:
+        error_msg = f"Error extracting ZIP: {str(e)}"
+        raise ZipFileError(error_msg) from e
+
+
+def extract_zip_to_destinations(zip_path, resolve_destination, fallback_dir, max_workers=None):
+    """
+    Extract each ZIP member straight to its final destination (no temporary tree + move)
+    
+    Args:
+        zip_path (str): ZIP file path
+        resolve_destination (callable): Called with the member file name (without folders), returns
+            destination file path (its directory must exist) or None to extract into fallback_dir
+        fallback_dir (str): Directory for members without destination (kept for inspection)
+        max_workers (int): Number of worker threads (default: ZIP_EXTRACT_MAX_WORKERS)
+        
+    Returns:
+        list: Destination paths of the members that had a destination
+        
+    Raises:
+        FileNotFoundError: If ZIP file does not exist
+        ZipFileError: If ZIP file is corrupted or there is an error extracting
+    """
+    if not os.path.exists(zip_path):
+        error_msg = f"ZIP file does not exist: {zip_path}"
+        raise FileNotFoundError(error_msg)
+    
+    try:
+        members = []
+        destination_paths = []
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+                path_parts = _get_zip_member_path_parts(info.filename)
+                if not path_parts:
+                    continue
+                destination_path = resolve_destination(path_parts[-1])
+                if destination_path:
+                    destination_paths.append(destination_path)
+                else:
+                    destination_path = _get_zip_member_target_path(fallback_dir, path_parts)
+                    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+                members.append((info.filename, destination_path))
+        
+        if members:
+            workers = _extract_zip_members_parallel(zip_path, members, max_workers)
+            logger.info(f"Extracted ZIP ({len(members)} files, {workers} threads): {zip_path}")
+        return destination_paths
+        
+    except zipfile.BadZipFile as e:
+        error_msg = f"ZIP file is corrupted: {zip_path}"
+        raise ZipFileError(error_msg) from e
+    except Exception as e:
+        error_msg = f"Error extracting ZIP: {str(e)}"
+        raise ZipFileError(error_msg) from e
+
+
 def clean_download_dir(download_dir):
     """
     Delete all files in download_dir but keep subdirectories
@@ -265,17 +564,16 @@ def clean_download_dir(download_dir):
     
     try:
         deleted_count = 0
-        for item in os.listdir(download_dir):
-            item_path = os.path.join(download_dir, item)
-            
-            # Only delete files, not directories
-            if os.path.isfile(item_path):
-                try:
-                    os.remove(item_path)
-                    deleted_count += 1
-                    logger.debug(f"Deleted file: {item}")
-                except Exception as e:
-                    logger.warning(f"Cannot delete file {item}: {str(e)}")
+        with os.scandir(download_dir) as entries:
+            for entry in entries:
+                # Only delete files, not directories
+                if entry.is_file():
+                    try:
+                        os.remove(entry.path)
+                        deleted_count += 1
+                        logger.debug(f"Deleted file: {entry.name}")
+                    except Exception as e:
+                        logger.warning(f"Cannot delete file {entry.name}: {str(e)}")
         
         if deleted_count > 0:
             logger.info(f"Deleted {deleted_count} file(s) in download_dir: {download_dir}")
@@ -307,6 +605,26 @@ def remove_file(file_path):
         raise FileOperationError(error_msg) from e
 
 
+def iter_files(folder_path):
+    """
+    Yield every file under folder_path (recursive, os.scandir with an explicit stack)
+    
+    Args:
+        folder_path (str): Folder to traverse
+        
+    Yields:
+        os.DirEntry: File entry (entry.name, entry.path)
+    """
+    stack = [folder_path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
 def find_file_in_zip_folder(zip_folder_path, doc_id, expected_name_pattern):
     """
     Find file in zip folder based on doc_id and expected_name_pattern
@@ -328,13 +646,20 @@ def find_file_in_zip_folder(zip_folder_path, doc_id, expected_name_pattern):
         raise FileNotFoundError(error_msg)
     
     try:
-        # Find file in zip folder
-        for root, dirs, files in os.walk(zip_folder_path):
-            for file in files:
-                # File from zip has format: expected_name_document_id.ext
-                if doc_id in file and expected_name_pattern in file:
-                    found_file = os.path.join(root, file)
-                    return found_file
+        # When the pattern already contains doc_id, one substring check covers both conditions
+        check_doc_id = doc_id not in expected_name_pattern
+        
+        # Find file in zip folder (iterative scandir walk, no per-directory lists)
+        pending_dirs = [zip_folder_path]
+        while pending_dirs:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                        continue
+                    # File from zip has format: expected_name_document_id.ext
+                    if expected_name_pattern in entry.name and (not check_doc_id or doc_id in entry.name):
+                        return entry.path
         
         # File not found
         error_msg = f"File not found with doc_id={doc_id} and pattern={expected_name_pattern} in {zip_folder_path}"
@@ -347,9 +672,28 @@ def find_file_in_zip_folder(zip_folder_path, doc_id, expected_name_pattern):
         raise FileOperationError(error_msg) from e
 
 
+def _create_download_watcher(folder_path):
+    """
+    Create inotify watcher for folder_path
+    
+    Returns:
+        INotify: Watcher, or None if inotify_simple is not available (non-Linux) or fails
+    """
+    if INotify is None:
+        return None
+    try:
+        watcher = INotify()
+        watcher.add_watch(folder_path, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+        return watcher
+    except Exception as e:
+        logger.debug(f"Unable to create inotify watcher, falling back to polling: {str(e)}")
+        return None
+
+
 def wait_for_file_download(folder_path, expected_extension="", timeout=120):
     """
     Wait for file to be downloaded in folder_path
+    Wakes up on inotify events (CLOSE_WRITE / MOVED_TO) when available, otherwise polls
     
     Args:
         folder_path (str): Download directory
@@ -363,38 +707,47 @@ def wait_for_file_download(folder_path, expected_extension="", timeout=120):
         FileDownloadTimeoutError: If timeout and file not found
         FileOperationError: If there is an error waiting for file download
     """
+    watcher = None
     try:
         logger.info(f"Waiting for file to download (timeout: {timeout}s)...")
+        # Register watcher before the first scan so no event is missed in between
+        watcher = _create_download_watcher(folder_path)
         start_time = time.time()
         
-        while time.time() - start_time < timeout:
-            # Check for temporary files
-            temp_files = [f for f in os.listdir(folder_path) 
-                         if f.endswith(('.crdownload', '.tmp'))]
-            if temp_files:
-                time.sleep(2)
-                continue
+        while True:
+            # Scan directory once: temporary files and candidate files
+            has_temp_files = False
+            latest_file = None
+            latest_mtime = None
+            with os.scandir(folder_path) as it:
+                for entry in it:
+                    if entry.name.endswith(('.crdownload', '.tmp')):
+                        has_temp_files = True
+                        break
+                    if not entry.is_file():
+                        continue
+                    if expected_extension and not entry.name.endswith(expected_extension):
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if latest_mtime is None or mtime > latest_mtime:
+                        latest_file = entry.path
+                        latest_mtime = mtime
             
-            # Get list of files
-            if expected_extension:
-                files = [f for f in os.listdir(folder_path)
-                        if f.endswith(expected_extension) and 
-                        os.path.isfile(os.path.join(folder_path, f))]
-            else:
-                files = [f for f in os.listdir(folder_path)
-                        if os.path.isfile(os.path.join(folder_path, f))]
+            # Check if file download is complete
+            if (not has_temp_files and latest_file
+                    and not os.path.exists(latest_file + ".crdownload")):
+                logger.info(f"File download completed: {os.path.basename(latest_file)}")
+                return latest_file
             
-            if files:
-                # Get latest file
-                full_paths = [os.path.join(folder_path, f) for f in files]
-                latest_file = max(full_paths, key=os.path.getmtime)
-                
-                # Check if file download is complete
-                if not os.path.exists(latest_file + ".crdownload"):
-                    logger.info(f"File download completed: {os.path.basename(latest_file)}")
-                    return latest_file
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                break
             
-            time.sleep(2)
+            wait_time = min(DOWNLOAD_POLL_INTERVAL, remaining)
+            if watcher is None:
+                time.sleep(wait_time)
+            else:
+                watcher.read(timeout=int(wait_time * 1000))
         
         error_msg = f"Timeout: File not found after {timeout} seconds"
         raise FileDownloadTimeoutError(error_msg)
@@ -404,4 +757,7 @@ def wait_for_file_download(folder_path, expected_extension="", timeout=120):
     except Exception as e:
         error_msg = f"Error waiting for file download: {str(e)}"
         raise FileOperationError(error_msg) from e
+    finally:
+        if watcher is not None:
+            watcher.close()
 
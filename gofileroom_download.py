@@ -10,11 +10,12 @@ import time
 import sys
 import logging
 import shutil
-import zipfile
 import traceback
+from itertools import chain
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from openpyxl import load_workbook
+from openpyxl import load_workbook, Workbook
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -28,13 +29,20 @@ import config
 from document_mapping import get_document_category, get_all_categories
 from file_handler import (
     rename_file_with_doc_id, move_file, move_csv_to_storage,
-    move_zip_to_storage, extract_zip, remove_file, find_file_in_zip_folder
+    move_zip_to_storage, extract_zip, extract_zip_parallel, remove_file,
+    replace_or_move, ZipFileError
 )
 from excel_handler import ExcelHandler
 from email_handler import create_email_handler_from_config
 from models import Document, Client, BASE_DOWNLOAD_DIR
 from utils import resource_path, load_env_config
 
+# inotify (Linux) để thức dậy ngay khi download_dir thay đổi thay vì chỉ polling (tùy chọn)
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
 
 # Thiết lập logging
 log_file_name = 'gofileroom_download.log'
@@ -50,6 +58,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Dòng phân cách trong log giữa các client
+LOG_SEPARATOR = "=" * 80
+
 class GofileRoomDownloader:
     """Class chính để xử lý download documents từ GOFILEROOM"""
     
@@ -83,6 +94,29 @@ class GofileRoomDownloader:
         # Khởi tạo ExcelHandler (sẽ được set sau khi load workbook)
         self.excel_handler = None
         
+        # Các cập nhật status document đang chờ ghi vào Excel theo doc_id (flush một lần mỗi page)
+        self._pending_excel_updates = {}
+        
+        # Các folder đã tạo trong lần chạy này (tránh stat/makedirs lặp lại)
+        self._created_dirs = set()
+        
+        # Plan đường dẫn của từng document cho client hiện tại (xem _get_row_plan)
+        self._row_plan = {}
+        
+        # Số client đã cập nhật vào Excel kể từ lần lưu gần nhất (xem run)
+        self._dirty_since_save = 0
+        
+        # (giây, chuỗi đã format) của lần gọi _get_download_time gần nhất
+        self._download_time_cache = (None, "")
+        
+        # Số cột của các cột status trong document list sheet (xem _get_document_status_columns)
+        self._document_status_columns = None
+        
+        # CSV sidecar ghi log documents (được export ra workbook write_only khi kết thúc)
+        self._log_csv_path = ""
+        self._log_csv_file = None
+        self._log_csv_writer = None
+        
         # Khởi tạo EmailHandler
         self.email_handler = create_email_handler_from_config(self.config)
         
@@ -206,6 +240,15 @@ class GofileRoomDownloader:
             self.driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
             self.wait = WebDriverWait(self.driver, config.EXPLICIT_WAIT)
             
+            # prefs không áp dụng khi attach vào Chrome đang chạy, set download dir qua CDP
+            try:
+                self.driver.execute_cdp_cmd(
+                    "Page.setDownloadBehavior",
+                    {"behavior": "allow", "downloadPath": self.download_dir}
+                )
+            except Exception as e:
+                logger.warning(f"Không thể set download dir qua CDP, dùng setting của Chrome: {str(e)}")
+            
         except Exception as e:
             logger.error(f"Lỗi khi kết nối với Chrome: {str(e)}")
             logger.error(traceback.format_exc())
@@ -236,12 +279,24 @@ class GofileRoomDownloader:
             
             self.client_list_sheet = self.workbook[client_list_sheet_name]
             self.document_list_sheet = self.workbook[document_list_sheet_name]
+            self._document_status_columns = None
             
             # Khởi tạo ExcelHandler
             self.excel_handler = ExcelHandler(
                 self.workbook, self.client_list_sheet, self.document_list_sheet, excel_file_path
             )
             
+            # Mở CSV sidecar để ghi log documents
+            self._open_document_log_csv(excel_file_path)
+            
+            # CSV còn lại từ lần chạy bị dừng đột ngột: đưa status vào Excel trước khi resume
+            try:
+                applied_count = self._apply_document_log_to_sheet()
+                if applied_count:
+                    logger.info(f"Đã khôi phục status của {applied_count} document từ CSV log")
+            except Exception as e:
+                logger.warning(f"Không thể khôi phục status từ CSV log documents: {str(e)}")
+            
             # Đọc header để xác định vị trí cột
             header_row = [cell.value for cell in self.client_list_sheet[1]]
             logger.info(f"Header row: {header_row}")
@@ -269,6 +324,8 @@ class GofileRoomDownloader:
                     client_number_cell = row[client_number_idx]
                     
                     if client_name_cell.value and client_number_cell.value:
+                        client_name = str(client_name_cell.value).strip()
+                        client_number = str(client_number_cell.value).strip()
                         client_data.append({
                             'row_index': row_idx,
                             'status_cell': row[status_idx],
@@ -279,8 +336,9 @@ class GofileRoomDownloader:
                             'total_documents_cell': row[total_docs_idx],
                             'num_files_downloaded_cell': row[num_files_downloaded_idx],
                             'client_folder_path_cell': row[client_folder_path_idx],
-                            'client_name': str(client_name_cell.value).strip(),
-                            'client_number': str(client_number_cell.value).strip(),
+                            'client_name': client_name,
+                            'client_number': client_number,
+                            'client_dir': f"{client_name}-{client_number}",
                         })
             
             logger.info(f"Đã đọc {len(client_data)} client có Status = Pending")
@@ -297,14 +355,14 @@ class GofileRoomDownloader:
             logger.info("Đang dọn sạch download_dir (chỉ xóa file, giữ folder)...")
             files_deleted = 0
             
-            for item in os.listdir(self.download_dir):
-                item_path = os.path.join(self.download_dir, item)
-                try:
-                    if os.path.isfile(item_path):
-                        os.remove(item_path)
-                        files_deleted += 1
-                except Exception as e:
-                    logger.warning(f"Không thể xóa file {item_path}: {str(e)}")
+            with os.scandir(self.download_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            os.remove(entry.path)
+                            files_deleted += 1
+                    except Exception as e:
+                        logger.warning(f"Không thể xóa file {entry.path}: {str(e)}")
             
             logger.info(f"Đã xóa {files_deleted} file trong download_dir")
             return True
@@ -317,12 +375,8 @@ class GofileRoomDownloader:
     def _count_files_in_download_dir(self):
         """Đếm số file (không phải folder) trong download_dir"""
         try:
-            count = 0
-            for item in os.listdir(self.download_dir):
-                item_path = os.path.join(self.download_dir, item)
-                if os.path.isfile(item_path):
-                    count += 1
-            return count
+            with os.scandir(self.download_dir) as entries:
+                return sum(1 for entry in entries if entry.is_file())
         except Exception as e:
             logger.error(f"Lỗi khi đếm file trong download_dir: {str(e)}")
             return 0
@@ -424,7 +478,12 @@ class GofileRoomDownloader:
             
             try:
                 client_list_ul = client_tree_root.find_element(By.XPATH, "./ul")
-                client_item_a_tags = client_list_ul.find_elements(By.TAG_NAME, "a")
+                # Lấy tất cả thẻ <a> và text của chúng trong một lần execute_script (thay cho .text trên từng thẻ)
+                client_item_a_tags, client_item_texts = self.driver.execute_script(
+                    "const tags = Array.from(arguments[0].querySelectorAll('a'));"
+                    "return [tags, tags.map(a => a.textContent.trim())];",
+                    client_list_ul
+                )
                 
                 if not client_item_a_tags:
                     error_msg = "Không tìm thấy client items trong cây thư mục"
@@ -434,11 +493,12 @@ class GofileRoomDownloader:
                 
                 # Tìm client phù hợp
                 client_item = None
-                for a_tag in client_item_a_tags:
-                    a_tag_text = str(a_tag.text)
-                    search_text = f"{client_name} | {client_number}".lower()
-                    if a_tag_text.lower().startswith(search_text):
+                client_item_text = ""
+                search_text = f"{client_name} | {client_number}".lower()
+                for a_tag, a_tag_text in zip(client_item_a_tags, client_item_texts):
+                    if a_tag_text[:len(search_text)].lower() == search_text:
                         client_item = a_tag
+                        client_item_text = a_tag_text
                         break
                 
                 if not client_item:
@@ -454,7 +514,7 @@ class GofileRoomDownloader:
                 
                 # Lấy số lượng documents từ text (format: "Client Name | Number (count)")
                 pattern = r'\((\d+)\)'
-                match = re.search(pattern, client_item.text)
+                match = re.search(pattern, client_item_text)
                 if match:
                     number_documents = int(match.group(1))
                     logger.info(f"Tìm thấy client với {number_documents} documents")
@@ -481,40 +541,47 @@ class GofileRoomDownloader:
             self.error_description = error_msg
             return False, None
     
+    DOWNLOAD_POLL_INTERVAL = 0.5  # giây giữa các lần quét download_dir
+    DOWNLOAD_EVENT_MAX_WAIT = 2  # giây chờ tối đa một event inotify trước khi quét lại
+    EXPORT_STAGING_FOLDER = "_staging"  # subfolder của download_dir chứa file đang chờ move
+    
     def _wait_for_file_download(self, expected_extension="", timeout=120):
         """Chờ file được tải về trong download_dir"""
+        watcher = self._create_download_dir_watcher()
         try:
             logger.info(f"Đang chờ file được tải về (timeout: {timeout}s)...")
             start_time = time.time()
             
             while time.time() - start_time < timeout:
-                # Kiểm tra file tạm
-                temp_files = [f for f in os.listdir(self.download_dir) 
-                             if f.endswith(('.crdownload', '.tmp'))]
-                if temp_files:
-                    time.sleep(2)
-                    continue
+                # Quét download_dir một lần: phát hiện file tạm và lấy file mới nhất
+                has_temp_file = False
+                latest_file = None
+                latest_mtime = None
+                with os.scandir(self.download_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(('.crdownload', '.tmp')):
+                            has_temp_file = True
+                            break
+                        if expected_extension and not entry.name.endswith(expected_extension):
+                            continue
+                        if not entry.is_file():
+                            continue
+                        entry_mtime = entry.stat().st_mtime
+                        if latest_mtime is None or entry_mtime > latest_mtime:
+                            latest_file = entry.path
+                            latest_mtime = entry_mtime
                 
-                # Lấy danh sách file
-                if expected_extension:
-                    files = [f for f in os.listdir(self.download_dir)
-                            if f.endswith(expected_extension) and 
-                            os.path.isfile(os.path.join(self.download_dir, f))]
-                else:
-                    files = [f for f in os.listdir(self.download_dir)
-                            if os.path.isfile(os.path.join(self.download_dir, f))]
+                if has_temp_file:
+                    self._wait_for_download_dir_change(watcher)
+                    continue
                 
-                if files:
-                    # Lấy file mới nhất
-                    full_paths = [os.path.join(self.download_dir, f) for f in files]
-                    latest_file = max(full_paths, key=os.path.getmtime)
-                    
+                if latest_file:
                     # Kiểm tra file đã hoàn thành chưa
                     if not os.path.exists(latest_file + ".crdownload"):
                         logger.info(f"File đã tải xong: {os.path.basename(latest_file)}")
                         return True, latest_file
                 
-                time.sleep(2)
+                self._wait_for_download_dir_change(watcher)
             
             error_msg = f"Timeout: Không tìm thấy file sau {timeout} giây"
             logger.error(error_msg)
@@ -527,6 +594,157 @@ class GofileRoomDownloader:
             logger.error(traceback.format_exc())
             self.error_description = error_msg
             return False, None
+        finally:
+            if watcher is not None:
+                watcher.close()
+    
+    def _create_download_dir_watcher(self):
+        """Tạo inotify watcher cho download_dir (None nếu không có inotify_simple hoặc không phải Linux)"""
+        if INotify is None:
+            return None
+        try:
+            watcher = INotify()
+            watcher.add_watch(
+                self.download_dir,
+                inotify_flags.CREATE | inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+            )
+            return watcher
+        except Exception as e:
+            logger.debug(f"Không thể tạo inotify watcher, dùng polling: {str(e)}")
+            return None
+    
+    def _wait_for_download_dir_change(self, watcher):
+        """Chờ download_dir thay đổi (inotify) hoặc hết một chu kỳ polling"""
+        if watcher is None:
+            time.sleep(self.DOWNLOAD_POLL_INTERVAL)
+            return
+        watcher.read(timeout=int(self.DOWNLOAD_EVENT_MAX_WAIT * 1000))
+    
+    def _wait_until(self, condition, timeout=15):
+        """
+        Chờ đến khi condition thỏa mãn (thay cho time.sleep cố định)
+        
+        Args:
+            condition: Expected condition hoặc callable nhận driver
+            timeout (int): Thời gian chờ tối đa (giây)
+            
+        Returns:
+            Kết quả của condition nếu thỏa mãn, None nếu timeout
+        """
+        try:
+            return WebDriverWait(self.driver, timeout).until(condition)
+        except TimeoutException:
+            logger.debug(f"Timeout sau {timeout}s khi chờ condition: {condition}")
+            return None
+    
+    def _file_appeared_in_download_dir(self, expected_extension=""):
+        """
+        Tạo condition cho WebDriverWait: có file (kể cả file tạm đang tải) xuất hiện trong download_dir
+        
+        Args:
+            expected_extension (str): Extension mong đợi (vd: ".zip"), rỗng nếu chấp nhận mọi file
+            
+        Returns:
+            callable: Condition nhận driver, trả về True khi file xuất hiện
+        """
+        suffixes = (expected_extension, '.crdownload', '.tmp')
+        
+        def condition(driver):
+            with os.scandir(self.download_dir) as entries:
+                for entry in entries:
+                    if expected_extension and not entry.name.endswith(suffixes):
+                        continue
+                    if entry.is_file():
+                        return True
+            return False
+        
+        return condition
+    
+    def _get_page_document_ids(self, document_table):
+        """
+        Lấy document ID của tất cả các row trên page hiện tại bằng một lần execute_script
+        (thay cho find_elements + .text trên từng row)
+        
+        Args:
+            document_table: WebElement của document table
+            
+        Returns:
+            list: Document ID theo thứ tự row, "" nếu row không đủ cells
+        """
+        doc_ids = self.driver.execute_script(
+            """
+            const rows = arguments[0].querySelectorAll(arguments[1]);
+            return Array.from(rows).map(row => {
+                const cells = row.querySelectorAll(arguments[2]);
+                return cells.length > arguments[3] ? cells[arguments[3]].textContent.trim() : "";
+            });
+            """,
+            document_table,
+            config.DOCUMENT_TABLE_ROW_CSS,
+            config.DOCUMENT_DATA_CELL_CSS,
+            config.DOCUMENT_ID_CELL_INDEX
+        )
+        return doc_ids or []
+    
+    def _get_row_document_id(self, row):
+        """
+        Lấy document ID của một row bằng một lần execute_script
+        (thay cho find_elements + .text trên cell)
+        
+        Args:
+            row: WebElement của document row
+            
+        Returns:
+            str: Document ID, None nếu row không đủ cells
+        """
+        return self.driver.execute_script(
+            """
+            const cells = arguments[0].querySelectorAll(arguments[1]);
+            return cells.length > arguments[2] ? cells[arguments[2]].textContent.trim() : null;
+            """,
+            row,
+            config.DOCUMENT_DATA_CELL_CSS,
+            config.DOCUMENT_ID_CELL_INDEX
+        )
+    
+    def _reset_bulk_selection(self, download_document_btn, select_all_checkbox):
+        """
+        Đóng menu download và bỏ chọn select all bằng một lần execute_script
+        (chỉ click checkbox nếu nó vẫn đang được chọn)
+        
+        Args:
+            download_document_btn: WebElement nút download (mở/đóng menu)
+            select_all_checkbox: WebElement header select all
+        """
+        self.driver.execute_script(
+            """
+            arguments[0].click();
+            const checkbox = arguments[1].querySelector('input[type="checkbox"]');
+            if (!checkbox) {
+                arguments[1].click();
+            } else if (checkbox.checked) {
+                checkbox.click();
+            }
+            """,
+            download_document_btn,
+            select_all_checkbox
+        )
+    
+    def _click_next_page(self, next_page_btn):
+        """
+        Click nút next page và chờ table được render lại (staleness của row cũ)
+        
+        Args:
+            next_page_btn: WebElement nút next page
+        """
+        old_rows = self.driver.find_elements(
+            config.DOCUMENT_TABLE_DIV_LOCATOR[0], 
+            config.DOCUMENT_TABLE_DIV_LOCATOR[1]
+        )
+        next_page_btn.click()
+        if old_rows:
+            self._wait_until(EC.staleness_of(old_rows[0]))
+        self._wait_until(EC.presence_of_element_located(config.DOCUMENT_TABLE_LOCATOR))
     
     def download_csv_list(self, client_name, client_number):
         """Tải CSV file chứa danh sách documents"""
@@ -577,6 +795,9 @@ class GofileRoomDownloader:
             self.error_description = error_msg
             return False, None
     
+    # Bảng xóa các ký tự không hợp lệ trong tên file (\ / : * ? " < > |), dựng một lần
+    INVALID_FILE_NAME_CHARS_TABLE = str.maketrans('', '', '\\/:*?"<>|')
+    
     def read_csv_file(self, csv_file_path, client_name_check, client_number_check):
         """Đọc file CSV và trả về dictionary với Document ID làm key"""
         try:
@@ -591,20 +812,22 @@ class GofileRoomDownloader:
             documents_data = {}
             
             with open(csv_file_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
+                # DictReader ánh xạ header -> giá trị trong module csv (C), bỏ qua dòng trống
+                reader = csv.DictReader(file, restval="")
                 
                 # Đọc header
-                try:
-                    header = next(reader)
-                    header = [h.strip() for h in header]
-                    
-                    # Tìm index các cột
-                    doc_id_index = header.index("Document ID")
-                    client_name_index = header.index("Client Name")
-                    client_number_index = header.index("Client Number")
-                    
-                except (StopIteration, ValueError) as e:
-                    error_msg = f"Lỗi khi đọc header CSV: {str(e)}"
+                if not reader.fieldnames:
+                    error_msg = "Lỗi khi đọc header CSV: file rỗng"
+                    logger.error(error_msg)
+                    self.error_description = error_msg
+                    return None
+                reader.fieldnames = [h.strip() for h in reader.fieldnames]
+                missing_columns = [
+                    column for column in ("Document ID", "Client Name", "Client Number")
+                    if column not in reader.fieldnames
+                ]
+                if missing_columns:
+                    error_msg = f"Lỗi khi đọc header CSV: thiếu cột {missing_columns}"
                     logger.error(error_msg)
                     self.error_description = error_msg
                     return None
@@ -617,8 +840,8 @@ class GofileRoomDownloader:
                     return documents_data
                 
                 # Kiểm tra Client Name/Number từ hàng đầu tiên
-                actual_client_name = first_data_row[client_name_index].strip().strip('"')
-                actual_client_number = first_data_row[client_number_index].strip().strip('"')
+                actual_client_name = first_data_row["Client Name"].strip().strip('"')
+                actual_client_number = first_data_row["Client Number"].strip().strip('"')
                 
                 if actual_client_number != client_number_check:
                     error_msg = (f"CSV file không khớp: "
@@ -628,20 +851,12 @@ class GofileRoomDownloader:
                     self.error_description = error_msg
                     return None
                 
-                # Đọc hàng đầu tiên
-                doc_id = first_data_row[doc_id_index].strip().strip('"')
-                documents_data[doc_id] = {
-                    header[i]: first_data_row[i].strip().strip('"') for i in range(len(header))
-                }
-                
-                # Đọc các hàng còn lại
-                for row in reader:
-                    if not row:
-                        continue
-                    doc_id = row[doc_id_index].strip().strip('"')
-                    documents_data[doc_id] = {
-                        header[i]: row[i].strip().strip('"') for i in range(len(header))
+                # Đọc tất cả các hàng (cột thừa không có header - key None - bị bỏ qua)
+                for row in chain((first_data_row,), reader):
+                    row_data = {
+                        key: value.strip().strip('"') for key, value in row.items() if key is not None
                     }
+                    documents_data[row_data["Document ID"]] = row_data
                 
                 # Tính expected_download_file_name cho mỗi document
                 for doc_id, doc_info in documents_data.items():
@@ -655,8 +870,7 @@ class GofileRoomDownloader:
                     if doc_info.get("Description"):
                         expected_name_items.append(str(doc_info["Description"]))
                     
-                    expected_name = "_".join(expected_name_items)
-                    expected_name = re.sub(r'[\\/:*?"<>|]', '', expected_name)
+                    expected_name = "_".join(expected_name_items).translate(self.INVALID_FILE_NAME_CHARS_TABLE)
                     file_type = doc_info.get("File Type", "pdf")
                     expected_name = f"{expected_name}.{file_type}"
                     doc_info["expected_download_file_name"] = expected_name
@@ -671,6 +885,198 @@ class GofileRoomDownloader:
             self.error_description = error_msg
             return None
     
+    DOCUMENT_LOG_CSV_HEADER = [
+        "Row Index", "Download Status", "Download Description", "Client Name", "Client Number",
+        "File Name", "File Path", "File Section", "Document Type", "Description", "Year",
+        "Document Date", "File Size", "Document ID", "File Type", "Download time"
+    ]
+    
+    def _open_document_log_csv(self, excel_file_path):
+        """
+        Mở CSV sidecar (append) để ghi log documents song song với Excel
+        
+        Args:
+            excel_file_path (str): Đường dẫn file Excel, CSV sẽ nằm cạnh với hậu tố _document_log.csv
+        """
+        try:
+            self._log_csv_path = f"{os.path.splitext(excel_file_path)[0]}_document_log.csv"
+            is_new_file = not os.path.exists(self._log_csv_path)
+            # Line-buffered: mỗi dòng log được ghi xuống đĩa ngay, không mất khi script dừng giữa chừng
+            self._log_csv_file = open(self._log_csv_path, 'a', buffering=1, newline='', encoding='utf-8')
+            self._log_csv_writer = csv.writer(self._log_csv_file)
+            if is_new_file:
+                self._log_csv_writer.writerow(self.DOCUMENT_LOG_CSV_HEADER)
+            logger.info(f"Đã mở CSV log documents: {self._log_csv_path}")
+        except Exception as e:
+            logger.warning(f"Không thể mở CSV log documents: {str(e)}")
+            self._log_csv_file = None
+            self._log_csv_writer = None
+    
+    def _write_document_log_csv(self, row_index, download_status="", download_description="",
+                                client_name="", client_number="", file_name="", file_path="",
+                                file_section="", document_type="", description="", year="",
+                                document_date="", file_size="", doc_id="", file_type="", download_time=""):
+        """Ghi một dòng log document vào CSV sidecar (bỏ qua nếu CSV chưa được mở)"""
+        if not self._log_csv_writer:
+            return
+        try:
+            self._log_csv_writer.writerow([
+                row_index, download_status, download_description, client_name, client_number,
+                file_name, file_path, file_section, document_type, description, year,
+                document_date, file_size, doc_id, file_type, download_time
+            ])
+        except Exception as e:
+            logger.warning(f"Lỗi khi ghi CSV log document {doc_id}: {str(e)}")
+    
+    def _read_document_log_rows(self):
+        """
+        Đọc CSV sidecar và gộp các dòng log theo document (Row Index, Document ID)
+        Mỗi cập nhật chỉ ghi các cột thay đổi, nên giá trị không rỗng của dòng sau ghi đè lên dòng trước
+        (dòng đầu tiên là dòng document gốc)
+        
+        Returns:
+            list: Mỗi document một dòng đã gộp, theo thứ tự xuất hiện lần đầu
+        """
+        merged_rows = {}
+        doc_id_idx = self.DOCUMENT_LOG_CSV_HEADER.index("Document ID")
+        with open(self._log_csv_path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Bỏ qua header
+            for row in reader:
+                if not row:
+                    continue
+                # Khóa theo Row Index và Document ID: CSV còn lại từ lần chạy trước có thể
+                # có cùng Row Index cho một document khác
+                key = (row[0], row[doc_id_idx] if len(row) > doc_id_idx else "")
+                merged_row = merged_rows.get(key)
+                if merged_row is None:
+                    merged_rows[key] = row
+                    continue
+                for column_idx, value in enumerate(row):
+                    if not value:
+                        continue
+                    if column_idx < len(merged_row):
+                        merged_row[column_idx] = value
+                    else:
+                        merged_row.append(value)
+        return list(merged_rows.values())
+    
+    def _apply_document_log_to_sheet(self):
+        """
+        Ghi status đã gộp từ CSV sidecar vào document_list_sheet (trong bộ nhớ)
+        Chỉ ghi vào row có Document ID khớp, tránh ghi nhầm khi Row Index trong CSV không còn đúng
+        (ví dụ row được thêm ở lần chạy bị dừng trước khi lưu Excel)
+        
+        Returns:
+            int: Số document đã cập nhật
+        """
+        if not self._log_csv_path or not os.path.exists(self._log_csv_path):
+            return 0
+        status_columns = self._get_document_status_columns()
+        if status_columns is None:
+            return 0
+        
+        sheet = self.document_list_sheet
+        header_row = [cell.value for cell in sheet[1]]
+        try:
+            doc_id_column = header_row.index('Document ID') + 1
+        except ValueError as e:
+            logger.error(f"Không tìm thấy cột trong header: {str(e)}")
+            return 0
+        
+        doc_id_idx = self.DOCUMENT_LOG_CSV_HEADER.index("Document ID")
+        log_columns = {
+            column_name: self.DOCUMENT_LOG_CSV_HEADER.index(column_name)
+            for column_name in status_columns
+        }
+        
+        applied_count = 0
+        for row in self._read_document_log_rows():
+            try:
+                row_index = int(row[0])
+            except ValueError:
+                continue
+            # Không dùng sheet.cell cho row ngoài sheet (sẽ tạo row rỗng)
+            if row_index < 2 or row_index > sheet.max_row:
+                continue
+            doc_id = row[doc_id_idx].strip() if len(row) > doc_id_idx else ""
+            sheet_doc_id = sheet.cell(row=row_index, column=doc_id_column).value
+            if not doc_id or str(sheet_doc_id or "").strip() != doc_id:
+                continue
+            
+            for column_name, column in status_columns.items():
+                log_idx = log_columns[column_name]
+                value = row[log_idx] if len(row) > log_idx else ""
+                if value:
+                    sheet.cell(row=row_index, column=column, value=value)
+            applied_count += 1
+        return applied_count
+    
+    def _finalize_document_log(self):
+        """
+        Ghi các cập nhật đang chờ và CSV sidecar vào document_list_sheet rồi lưu workbook lần cuối
+        Chạy trong cleanup() (kể cả khi bị dừng giữa chừng) để lần chạy sau resume từ Excel với status đúng
+        
+        Returns:
+            bool: True nếu đã lưu workbook
+        """
+        if not self.excel_handler:
+            return False
+        try:
+            self._flush_document_status_updates()
+            applied_count = self._apply_document_log_to_sheet()
+            self.excel_handler.save_workbook()
+            logger.info(f"Đã đưa status của {applied_count} document từ CSV log vào Excel và lưu")
+            return True
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu status document vào Excel lần cuối: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
+    
+    def _export_document_log_workbook(self, remove_csv=True):
+        """
+        Đóng CSV sidecar và stream log đã gộp (mỗi document một dòng) vào một workbook write_only
+        Workbook write_only không giữ cell trong bộ nhớ nên chi phí bộ nhớ không tăng theo số dòng
+        Sau khi export thành công, CSV sidecar được xóa để lần chạy sau bắt đầu file mới
+        
+        Args:
+            remove_csv (bool): False để giữ CSV sidecar (khi status chưa được lưu vào Excel)
+        
+        Returns:
+            str: Đường dẫn file xlsx đã export, "" nếu không export
+        """
+        if not self._log_csv_file:
+            return ""
+        
+        try:
+            self._log_csv_file.close()
+        except Exception as e:
+            logger.warning(f"Lỗi khi đóng CSV log documents: {str(e)}")
+        self._log_csv_file = None
+        self._log_csv_writer = None
+        
+        try:
+            export_path = f"{os.path.splitext(self._log_csv_path)[0]}.xlsx"
+            log_workbook = Workbook(write_only=True)
+            log_sheet = log_workbook.create_sheet("Document Log")
+            log_sheet.append(self.DOCUMENT_LOG_CSV_HEADER)
+            for row in self._read_document_log_rows():
+                log_sheet.append(row)
+            log_workbook.save(export_path)
+            logger.info(f"Đã export log documents vào: {export_path}")
+        except Exception as e:
+            logger.error(f"Lỗi khi export log documents ra workbook: {str(e)}")
+            logger.error(traceback.format_exc())
+            return ""
+        
+        if not remove_csv:
+            return export_path
+        try:
+            os.remove(self._log_csv_path)
+        except OSError as e:
+            logger.warning(f"Không thể xóa CSV log documents sau khi export: {str(e)}")
+        return export_path
+    
     def _find_document_row_in_excel(self, client_name, client_number, document_id, year, file_type):
         """Tìm row trong document_list_sheet với thông tin đã cho"""
         try:
@@ -779,6 +1185,21 @@ class GofileRoomDownloader:
                     new_row_index = self.document_list_sheet.max_row
                     doc_id_to_row_index[doc_id] = new_row_index
                     new_rows_count += 1
+                    
+                    self._write_document_log_csv(
+                        new_row_index,
+                        client_name=client_name,
+                        client_number=client_number,
+                        file_name=doc_info.get("expected_download_file_name", ""),
+                        file_section=doc_info.get("File Section", ""),
+                        document_type=doc_info.get("Document Type", ""),
+                        description=doc_info.get("Description", ""),
+                        year=doc_info.get("Year", ""),
+                        document_date=doc_info.get("Document Date", ""),
+                        file_size=doc_info.get("File Size", ""),
+                        doc_id=doc_id,
+                        file_type=doc_info.get("File Type", "")
+                    )
             
             logger.info(f"Đã log documents: {new_rows_count} mới, {existing_rows_count} đã tồn tại")
             return doc_id_to_row_index
@@ -836,11 +1257,14 @@ class GofileRoomDownloader:
                 return False, ""
             
             full_path = os.path.join(parent_folder, folder_name)
+            if full_path in self._created_dirs:
+                return True, full_path
             
-            if not os.path.exists(full_path):
-                os.makedirs(full_path, exist_ok=True)
-                logger.debug(f"Đã tạo folder: {full_path}")
+            # makedirs(exist_ok=True) đã bao gồm kiểm tra tồn tại, không cần os.path.exists trước
+            os.makedirs(full_path, exist_ok=True)
+            logger.debug(f"Đã đảm bảo folder tồn tại: {full_path}")
             
+            self._created_dirs.add(full_path)
             return True, full_path
             
         except Exception as e:
@@ -897,6 +1321,28 @@ class GofileRoomDownloader:
         
         return success, full_path
     
+    def _get_document_status_columns(self):
+        """
+        Lấy (và cache) số cột (1-based) của các cột status trong document list sheet
+        
+        Returns:
+            dict: Tên cột -> số cột, None nếu header thiếu cột
+        """
+        if self._document_status_columns is not None:
+            return self._document_status_columns
+        
+        header_row = [cell.value for cell in self.document_list_sheet[1]]
+        try:
+            self._document_status_columns = {
+                column_name: header_row.index(column_name) + 1
+                for column_name in ('Download Status', 'Download Description', 'File Name',
+                                    'File Path', 'Download time')
+            }
+        except ValueError as e:
+            logger.error(f"Không tìm thấy cột trong header: {str(e)}")
+            return None
+        return self._document_status_columns
+    
     def update_document_status_in_excel(self, doc_id, row_index, download_status, download_description, 
                                         file_name="", file_path="", download_time=""):
         """Cập nhật status của document trong Excel"""
@@ -904,31 +1350,27 @@ class GofileRoomDownloader:
             if not row_index:
                 return False
             
-            # Đọc header để tìm index các cột
-            header_row = [cell.value for cell in self.document_list_sheet[1]]
-            
-            try:
-                download_status_idx = header_row.index('Download Status')
-                download_desc_idx = header_row.index('Download Description')
-                file_name_idx = header_row.index('File Name')
-                file_path_idx = header_row.index('File Path')
-                download_time_idx = header_row.index('Download time')
-            except ValueError as e:
-                logger.error(f"Không tìm thấy cột trong header: {str(e)}")
+            # Index các cột (đọc header một lần cho mỗi sheet)
+            status_columns = self._get_document_status_columns()
+            if status_columns is None:
                 return False
             
-            # Cập nhật các cell
-            row = self.document_list_sheet[row_index]
-            if download_status:
-                row[download_status_idx].value = download_status
-            if download_description:
-                row[download_desc_idx].value = download_description
-            if file_name:
-                row[file_name_idx].value = file_name
-            if file_path:
-                row[file_path_idx].value = file_path
-            if download_time:
-                row[download_time_idx].value = download_time
+            # Ghi thẳng vào từng cell theo (row, column), không dựng lại cả row
+            sheet = self.document_list_sheet
+            for column_name, value in (
+                ('Download Status', download_status),
+                ('Download Description', download_description),
+                ('File Name', file_name),
+                ('File Path', file_path),
+                ('Download time', download_time),
+            ):
+                if value:
+                    sheet.cell(row=row_index, column=status_columns[column_name], value=value)
+            
+            self._write_document_log_csv(
+                row_index, download_status, download_description,
+                file_name=file_name, file_path=file_path, doc_id=doc_id, download_time=download_time
+            )
             
             return True
             
@@ -937,6 +1379,33 @@ class GofileRoomDownloader:
             logger.error(traceback.format_exc())
             return False
     
+    def _queue_document_status_update(self, doc_id, row_index, download_status, download_description,
+                                      file_name="", file_path="", download_time=""):
+        """
+        Đưa cập nhật status document vào hàng đợi, ghi vào Excel khi gọi _flush_document_status_updates
+        (mỗi document chỉ giữ cập nhật cuối cùng)
+        """
+        if not row_index:
+            return
+        self._pending_excel_updates.pop(doc_id, None)
+        self._pending_excel_updates[doc_id] = (
+            doc_id, row_index, download_status, download_description, file_name, file_path, download_time
+        )
+    
+    def _flush_document_status_updates(self):
+        """
+        Ghi toàn bộ cập nhật status đang chờ vào Excel (trong bộ nhớ)
+        Không lưu workbook ở đây: mỗi cập nhật đã được ghi vào CSV sidecar,
+        workbook được lưu theo nhóm client trong run() và lần cuối trong cleanup()
+        """
+        if not self._pending_excel_updates:
+            return
+        
+        pending_updates = self._pending_excel_updates
+        self._pending_excel_updates = {}
+        for update in pending_updates.values():
+            self.update_document_status_in_excel(*update)
+    
     def click_export_single_file(self, row_index, document):
         """
         Click export button cho một file riêng lẻ, tải file, đổi tên, move vào đúng folder
@@ -973,17 +1442,12 @@ class GofileRoomDownloader:
             row = document_rows[row_index]
             
             # Kiểm tra document ID trong row
-            document_data_cells = row.find_elements(
-                config.DOCUMENT_DATA_CELL_LOCATOR[0], 
-                config.DOCUMENT_DATA_CELL_LOCATOR[1]
-            )
-            
-            if len(document_data_cells) < 10:
+            row_doc_id = self._get_row_document_id(row)
+            if row_doc_id is None:
                 error_msg = "Không tìm thấy đủ cells trong document row"
                 logger.error(error_msg)
                 return False, "", error_msg
             
-            row_doc_id = document_data_cells[9].text.strip()
             if row_doc_id != document.document_id:
                 error_msg = f"Document ID không khớp: expected {document.document_id}, got {row_doc_id}"
                 logger.error(error_msg)
@@ -1127,7 +1591,7 @@ class GofileRoomDownloader:
             if os.path.exists(file_path):
                 logger.info(f"File đã tồn tại: {file_path}")
                 self.downloaded_documents = 1
-                download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                download_time = self._get_download_time()
                 row_index = doc_id_to_row_index.get(doc_id)
                 if row_index:
                     self.update_document_status_in_excel(
@@ -1152,18 +1616,13 @@ class GofileRoomDownloader:
                 return False
             
             row = document_rows[0]  # Row đầu tiên sau header
-            document_data_cells = row.find_elements(
-                config.DOCUMENT_DATA_CELL_LOCATOR[0], 
-                config.DOCUMENT_DATA_CELL_LOCATOR[1]
-            )
-            
-            if len(document_data_cells) < 10:
+            row_doc_id = self._get_row_document_id(row)
+            if row_doc_id is None:
                 error_msg = "Không tìm thấy đủ cells trong document row"
                 logger.error(error_msg)
                 self.error_description = error_msg
                 return False
             
-            row_doc_id = document_data_cells[9].text.strip()
             if row_doc_id != doc_id:
                 error_msg = f"Document ID không khớp: expected {doc_id}, got {row_doc_id}"
                 logger.error(error_msg)
@@ -1264,7 +1723,7 @@ class GofileRoomDownloader:
                 self.downloaded_documents = 1
                 
                 # Cập nhật Excel
-                download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                download_time = self._get_download_time()
                 row_index = doc_id_to_row_index.get(doc_id)
                 if row_index:
                     self.update_document_status_in_excel(
@@ -1293,7 +1752,7 @@ class GofileRoomDownloader:
             self.error_description = error_msg
             return False
     
-    def export_page_with_multiple_button(self, client_object, page_num, total_pages):
+    def export_page_with_multiple_button(self, client_object, page_num, total_pages, doc_id_to_row_index=None):
         """
         Export một page bằng cách click export button (export multiple)
         Nếu không click được thì sẽ chuyển sang export từng file lẻ
@@ -1302,6 +1761,7 @@ class GofileRoomDownloader:
             client_object (Client): Client object
             page_num (int): Số page hiện tại
             total_pages (int): Tổng số pages
+            doc_id_to_row_index (dict): Map doc_id -> row index trong Excel (để cập nhật status)
             
         Returns:
             tuple: (success: bool, error_msg: str)
@@ -1345,9 +1805,9 @@ class GofileRoomDownloader:
                     EC.element_to_be_clickable(config.OK_BTN_LOCALTOR)
                 )
                 btn_ok.click()
-                time.sleep(15)
+                # Chờ browser bắt đầu tải zip trước khi bỏ chọn và chuyển page
+                self._wait_until(self._file_appeared_in_download_dir(".zip"), timeout=15)
                 select_all_checkbox.click()
-                time.sleep(2)
                 
                 # Chuyển sang page tiếp theo (nếu chưa phải page cuối)
                 if page_num < total_pages:
@@ -1411,8 +1871,7 @@ class GofileRoomDownloader:
                 
             except (TimeoutException, NoSuchElementException, Exception) as e:
                 # Không thể click export button, chuyển sang export từng file
-                download_document_btn.click()
-                select_all_checkbox.click()
+                self._reset_bulk_selection(download_document_btn, select_all_checkbox)
                 error_msg = f"Không thể click export button cho page {page_num}: {str(e)}"
                 logger.warning(error_msg)
                 logger.info(f"Chuyển sang export từng file riêng lẻ cho page {page_num}")
@@ -1430,25 +1889,22 @@ class GofileRoomDownloader:
                 if len(document_rows) <= 0:
                     return False, "Không tìm thấy document row trong table"
                 
+                # Lấy document ID của cả page trong một lần gọi
+                row_doc_ids = self._get_page_document_ids(document_table)
+                
+                # Index document object theo document_id để tra cứu O(1)
+                documents_by_id = {doc.document_id: doc for doc in client_object.document_list}
+                doc_id_to_row_index = doc_id_to_row_index or {}
+                
                 # Export từng file
                 for i, row in enumerate(document_rows):
                     try:
-                        document_data_cells = row.find_elements(
-                            config.DOCUMENT_DATA_CELL_LOCATOR[0], 
-                            config.DOCUMENT_DATA_CELL_LOCATOR[1]
-                        )
-                        
-                        if len(document_data_cells) < 10:
+                        row_doc_id = row_doc_ids[i] if i < len(row_doc_ids) else ""
+                        if not row_doc_id:
                             continue
                         
-                        row_doc_id = document_data_cells[9].text.strip()
-                        
                         # Tìm document object
-                        document = None
-                        for doc in client_object.document_list:
-                            if doc.document_id == row_doc_id:
-                                document = doc
-                                break
+                        document = documents_by_id.get(row_doc_id)
                         
                         if not document:
                             logger.warning(f"Không tìm thấy document object cho doc_id: {row_doc_id}")
@@ -1456,28 +1912,27 @@ class GofileRoomDownloader:
                         
                         # Export file
                         success, file_path, error_msg = self.click_export_single_file(i, document)
+                        row_index = doc_id_to_row_index.get(row_doc_id)
                         if success:
                             # Cập nhật Excel
-                            download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            row_index = None  # TODO: Lấy từ doc_id_to_row_index nếu có
-                            if self.excel_handler and row_index:
-                                self.excel_handler.log_document_success(
-                                    document.document_id, row_index, 
-                                    document.document_name_with_id, 
-                                    file_path, document.category_name, download_time
-                                )
+                            download_time = self._get_download_time()
+                            self._queue_document_status_update(
+                                row_doc_id, row_index, "Success", "File downloaded successfully",
+                                document.document_name_with_id, file_path, download_time
+                            )
                             document.set_download_status("Success", "File downloaded successfully", download_time)
                             self.downloaded_documents += 1
                         else:
                             logger.warning(f"Không thể export file cho document {row_doc_id}: {error_msg}")
-                            if self.excel_handler and row_index:
-                                self.excel_handler.log_document_error(document.document_id, row_index, error_msg)
+                            self._queue_document_status_update(row_doc_id, row_index, "Error", error_msg)
                             document.set_download_status("Error", error_msg)
                     
                     except Exception as e:
                         logger.error(f"Lỗi khi export file cho row {i}: {str(e)}")
                         continue
                 
+                self._flush_document_status_updates()
+                
                 # Chuyển sang page tiếp theo (nếu chưa phải page cuối)
                 if page_num < total_pages:
                     try:
@@ -1509,6 +1964,8 @@ class GofileRoomDownloader:
         Export từng file riêng lẻ cho page hiện tại (khi export button bị disable)
         Method này được gọi từ export_multiple khi không thể click export button
         """
+        move_executor = None
+        move_futures = []
         try:
             logger.info(f"Đang export từng file riêng lẻ cho page hiện tại của client: {client_name}")
             
@@ -1527,38 +1984,38 @@ class GofileRoomDownloader:
                 self.error_description = error_msg
                 return False
             
+            # Lấy document ID của cả page trong một lần gọi
+            row_doc_ids = self._get_page_document_ids(document_table)
+            
+            # Browser chỉ tải được một file mỗi lần, nên việc move file vào thư mục đích
+            # (có thể là ổ mạng) được đẩy sang background thread để chồng lên lần tải kế tiếp
+            _, staging_dir = self._create_folder(self.EXPORT_STAGING_FOLDER, self.download_dir)
+            move_executor = ThreadPoolExecutor(max_workers=1)
+            
             # Lặp qua từng row
             for i, row in enumerate(document_rows):
+                row_doc_id = row_doc_ids[i] if i < len(row_doc_ids) else ""
                 try:
                     logger.info(f"Đang xử lý document row {i+1}/{len(document_rows)}")
                     
-                    document_data_cells = row.find_elements(
-                        config.DOCUMENT_DATA_CELL_LOCATOR[0], 
-                        config.DOCUMENT_DATA_CELL_LOCATOR[1]
-                    )
-
-                    if len(document_data_cells) < 10:
+                    if not row_doc_id:
                         error_msg = f"Không tìm thấy đủ cells trong document row {i+1}"
                         logger.warning(error_msg)
                         continue
                     
-                    row_doc_id = document_data_cells[9].text.strip()
-                    if row_doc_id not in csv_documents_dict.keys():
+                    # Lấy thông tin document từ csv_documents_dict
+                    doc_info = csv_documents_dict.get(row_doc_id)
+                    if doc_info is None:
                         error_msg = f"Document ID '{row_doc_id}' không hợp lệ (không có trong CSV)"
                         logger.warning(error_msg)
                         continue
-                    
-                    # Lấy thông tin document từ csv_documents_dict
-                    doc_info = csv_documents_dict[row_doc_id]
-                    expected_file_name = doc_info.get("expected_download_file_name", "")
-                    doc_year = doc_info.get("Year", "").strip()
-                    
-                    # Xác định category folder
-                    file_section = doc_info.get("File Section", "").strip()
-                    document_type = doc_info.get("Document Type", "").strip()
-                    description = doc_info.get("Description", "").strip()
-                    category_folder = get_document_category(file_section, document_type, description)
-                    category_dir = os.path.join(client_target_dir, category_folder)
+                    plan = self._get_row_plan(row_doc_id, doc_info, client_target_dir)
+                    expected_file_name = plan["expected_file_name"]
+                    expected_base = plan["expected_base"]
+                    expected_ext = plan["expected_ext"]
+                    doc_year = plan["doc_year"]
+                    category_dir = plan["category_dir"]
+                    file_path_with_doc_id = plan["final_dest"]
                     
                     # Kiểm tra file đã tồn tại chưa (kiểm tra cả tên gốc và tên có doc_id)
                     if doc_year:
@@ -1568,15 +2025,10 @@ class GofileRoomDownloader:
                             logger.error(error_msg)
                             row_index = doc_id_to_row_index.get(row_doc_id)
                             if row_index:
-                                self.update_document_status_in_excel(
+                                self._queue_document_status_update(
                                     row_doc_id, row_index, "Error", error_msg
                                 )
                             continue
-                        expected_base, expected_ext = os.path.splitext(expected_file_name)
-                        file_path_with_doc_id = os.path.join(category_dir, doc_year, f"{expected_base}_{row_doc_id}{expected_ext}")
-                    else:
-                        expected_base, expected_ext = os.path.splitext(expected_file_name)
-                        file_path_with_doc_id = os.path.join(category_dir, f"{expected_base}_{row_doc_id}{expected_ext}")
                     
                     # Kiểm tra file đã tồn tại (ưu tiên tên có doc_id)
                     existing_file_path = None
@@ -1586,11 +2038,11 @@ class GofileRoomDownloader:
                     if existing_file_path:
                         logger.info(f"File đã tồn tại: {existing_file_path}")
                         self.downloaded_documents += 1
-                        download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        download_time = self._get_download_time()
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
                             existing_file_name = os.path.basename(existing_file_path)
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Success", "File already exists",
                                 existing_file_name, existing_file_path, download_time
                             )
@@ -1606,7 +2058,7 @@ class GofileRoomDownloader:
                         logger.warning(error_msg)
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Error", error_msg
                             )
                         continue
@@ -1617,7 +2069,7 @@ class GofileRoomDownloader:
                         logger.warning(error_msg)
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Error", error_msg
                             )
                         continue
@@ -1630,14 +2082,14 @@ class GofileRoomDownloader:
                         logger.warning(error_msg)
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Error", error_msg
                             )
                         continue
                     
                     btn_export.click()
                     logger.info(f"Đã click export button cho document {row_doc_id}")
-                    time.sleep(5)
+                    self._wait_until(self._file_appeared_in_download_dir(), timeout=5)
                     
                     # Chờ file được tải về
                     success, downloaded_file_path = self._wait_for_file_download(timeout=120)
@@ -1646,7 +2098,7 @@ class GofileRoomDownloader:
                         logger.warning(error_msg)
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Error", error_msg
                             )
                         continue
@@ -1658,7 +2110,7 @@ class GofileRoomDownloader:
                         logger.warning(error_msg)
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Warning", error_msg
                             )
                         # Xóa file để tiếp tục
@@ -1671,7 +2123,6 @@ class GofileRoomDownloader:
                     # Kiểm tra tên file
                     downloaded_file_name = os.path.basename(downloaded_file_path)
                     base_name, ext = os.path.splitext(downloaded_file_name)
-                    expected_base, expected_ext = os.path.splitext(expected_file_name)
                     
                     if base_name != expected_base or ext != expected_ext:
                         error_msg = (f"Tên file không khớp cho document {row_doc_id}: "
@@ -1679,46 +2130,29 @@ class GofileRoomDownloader:
                         logger.warning(error_msg)
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Warning", error_msg
                             )
                         # Vẫn tiếp tục move file
                     
-                    # Đổi tên file để thêm document_id
+                    # Tên file mới có thêm document_id
                     new_file_name = f"{base_name}_{row_doc_id}{ext}"
-                    renamed_file_path = os.path.join(category_dir, new_file_name)
-                    try:
-                        os.rename(downloaded_file_path, renamed_file_path)
-                    except Exception as e:
-                        error_msg = f"Lỗi khi đổi tên file cho document {row_doc_id}: {str(e)}"
-                        logger.error(error_msg)
-                        row_index = doc_id_to_row_index.get(row_doc_id)
-                        if row_index:
-                            self.update_document_status_in_excel(
-                                row_doc_id, row_index, "Error", error_msg
-                            )
-                        continue
                     
-                    # Xác định destination path
-                    if doc_year:
-                        final_dest = os.path.join(category_dir, doc_year, new_file_name)
+                    # Xác định destination path (dùng plan nếu tên file khớp)
+                    if new_file_name == plan["new_file_name"]:
+                        final_dest = plan["final_dest"]
                     else:
-                        final_dest = os.path.join(category_dir, new_file_name)
+                        final_dest = f"{plan['dest_dir']}{os.sep}{new_file_name}"
                     
-                    # Move file vào category hoặc category/year folder
+                    # Đưa file ra khỏi download_dir ngay (rename cùng ổ), phần move vào
+                    # category hoặc category/year folder chạy ở background
                     try:
-                        shutil.move(renamed_file_path, final_dest)
-                        logger.info(f"Đã move file vào: {final_dest}")
-                        self.downloaded_documents += 1
-                        
-                        # Cập nhật Excel
-                        download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        row_index = doc_id_to_row_index.get(row_doc_id)
-                        if row_index:
-                            self.update_document_status_in_excel(
-                                row_doc_id, row_index, "Success", "File downloaded successfully",
-                                new_file_name, final_dest, download_time
-                            )
+                        staged_path = f"{staging_dir}{os.sep}{new_file_name}"
+                        os.replace(downloaded_file_path, staged_path)
+                        move_futures.append((
+                            row_doc_id, new_file_name, final_dest,
+                            move_executor.submit(self._move_exported_file, staged_path, final_dest)
+                        ))
                         
                     except Exception as e:
                         error_msg = f"Lỗi khi move file cho document {row_doc_id}: {str(e)}"
@@ -1726,7 +2160,7 @@ class GofileRoomDownloader:
                         logger.error(traceback.format_exc())
                         row_index = doc_id_to_row_index.get(row_doc_id)
                         if row_index:
-                            self.update_document_status_in_excel(
+                            self._queue_document_status_update(
                                 row_doc_id, row_index, "Error", error_msg
                             )
                         continue
@@ -1735,24 +2169,17 @@ class GofileRoomDownloader:
                     error_msg = f"Lỗi khi xử lý document row {i+1}: {str(e)}"
                     logger.error(error_msg)
                     logger.error(traceback.format_exc())
-                    # Cố gắng lấy doc_id để log
-                    try:
-                        document_data_cells = row.find_elements(
-                            config.DOCUMENT_DATA_CELL_LOCATOR[0], 
-                            config.DOCUMENT_DATA_CELL_LOCATOR[1]
+                    # Log lỗi theo doc_id đã lấy từ đầu page
+                    row_index = doc_id_to_row_index.get(row_doc_id)
+                    if row_index:
+                        self._queue_document_status_update(
+                            row_doc_id, row_index, "Error", error_msg
                         )
-                        if len(document_data_cells) >= 10:
-                            row_doc_id = document_data_cells[9].text.strip()
-                            if row_doc_id in doc_id_to_row_index:
-                                row_index = doc_id_to_row_index.get(row_doc_id)
-                                if row_index:
-                                    self.update_document_status_in_excel(
-                                        row_doc_id, row_index, "Error", error_msg
-                                    )
-                    except:
-                        pass
                     continue
             
+            self._collect_exported_file_moves(move_futures, doc_id_to_row_index)
+            move_executor.shutdown(wait=True)
+            self._flush_document_status_updates()
             logger.info(f"Hoàn thành export từng file riêng lẻ cho page hiện tại")
             return True
             
@@ -1761,8 +2188,100 @@ class GofileRoomDownloader:
             logger.error(error_msg)
             logger.error(traceback.format_exc())
             self.error_description = error_msg
+            if move_executor is not None:
+                self._collect_exported_file_moves(move_futures, doc_id_to_row_index)
+                move_executor.shutdown(wait=True)
+            self._flush_document_status_updates()
             return False
     
+    def _get_row_plan(self, doc_id, doc_info, client_target_dir):
+        """
+        Lấy (hoặc tính một lần rồi cache) category folder và đường dẫn đích của document
+        
+        Args:
+            doc_id (str): Document ID
+            doc_info (dict): Thông tin document từ csv_documents_dict
+            client_target_dir (str): Thư mục client
+            
+        Returns:
+            dict: expected_file_name, expected_base, expected_ext, doc_year,
+                  category_dir, dest_dir, new_file_name, final_dest
+        """
+        plan = self._row_plan.get(doc_id)
+        if plan is not None:
+            return plan
+        
+        expected_file_name = doc_info.get("expected_download_file_name", "")
+        expected_base, expected_ext = os.path.splitext(expected_file_name)
+        doc_year = doc_info.get("Year", "").strip()
+        category_folder = get_document_category(
+            doc_info.get("File Section", "").strip(),
+            doc_info.get("Document Type", "").strip(),
+            doc_info.get("Description", "").strip()
+        )
+        category_dir = os.path.join(client_target_dir, category_folder)
+        # category_dir đã là đường dẫn chuẩn nên nối chuỗi trực tiếp thay cho os.path.join
+        dest_dir = f"{category_dir}{os.sep}{doc_year}" if doc_year else category_dir
+        new_file_name = f"{expected_base}_{doc_id}{expected_ext}"
+        
+        plan = {
+            "expected_file_name": expected_file_name,
+            "expected_base": expected_base,
+            "expected_ext": expected_ext,
+            "doc_year": doc_year,
+            "category_dir": category_dir,
+            "dest_dir": dest_dir,
+            "new_file_name": new_file_name,
+            "final_dest": f"{dest_dir}{os.sep}{new_file_name}",
+        }
+        self._row_plan[doc_id] = plan
+        return plan
+    
+    def _move_exported_file(self, staged_path, final_dest):
+        """
+        Move file đã export từ staging folder vào thư mục đích (chạy ở background thread)
+        
+        Args:
+            staged_path (str): Đường dẫn file trong staging folder
+            final_dest (str): Đường dẫn đích (category hoặc category/year folder)
+            
+        Returns:
+            tuple: (success: bool, download_time hoặc error_msg: str)
+        """
+        try:
+            replace_or_move(staged_path, final_dest)
+            logger.info(f"Đã move file vào: {final_dest}")
+            return True, self._get_download_time()
+        except Exception as e:
+            error_msg = f"Lỗi khi move file vào {final_dest}: {str(e)}"
+            logger.error(error_msg)
+            logger.error(traceback.format_exc())
+            return False, error_msg
+    
+    def _collect_exported_file_moves(self, move_futures, doc_id_to_row_index):
+        """
+        Chờ các lần move file ở background hoàn thành và ghi status vào Excel queue
+        
+        Args:
+            move_futures (list): (doc_id, new_file_name, final_dest, future)
+            doc_id_to_row_index (dict): Map doc_id -> row index trong Excel
+        """
+        for doc_id, new_file_name, final_dest, future in move_futures:
+            success, result = future.result()
+            row_index = doc_id_to_row_index.get(doc_id)
+            if success:
+                self.downloaded_documents += 1
+                if row_index:
+                    self._queue_document_status_update(
+                        doc_id, row_index, "Success", "File downloaded successfully",
+                        new_file_name, final_dest, result
+                    )
+            elif row_index:
+                self._queue_document_status_update(
+                    doc_id, row_index, "Error", f"Lỗi khi move file cho document {doc_id}: {result}"
+                )
+        move_futures.clear()
+    
     def export_multiple(self, client_name, client_number, total_documents, 
                        csv_documents_dict, doc_id_to_row_index, client_target_dir):
         """Export multiple documents theo từng page (khi total_documents > 1)"""
@@ -1777,6 +2296,24 @@ class GofileRoomDownloader:
             zip_client_folder_path = os.path.join(self.zip_dir, zip_client_folder_name)
             os.makedirs(zip_client_folder_path, exist_ok=True)
             
+            # Plan (category folder, đường dẫn đích) của từng document, tính một lần cho client
+            self._row_plan = {}
+            
+            # Một worker giải nén tuần tự các zip rồi đưa file sang move_executor ngay,
+            # nên giải nén và move chạy song song với việc tải page tiếp theo
+            zip_executor = ThreadPoolExecutor(max_workers=1)
+            zip_futures = []
+            move_executor = ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 4))
+            move_state = {
+                "csv_documents_dict": csv_documents_dict,
+                "client_target_dir": client_target_dir,
+                "move_executor": move_executor,
+                "year_dir_cache": {},  # (category_folder, doc_year) -> (dest_dir, tên file đã có)
+                "move_futures": {},  # future -> (doc_id, expected_file_name, found_file, final_dest)
+                "dispatched_doc_ids": set(),
+                "failed_doc_ids": {},  # doc_id -> error_msg
+            }
+            
             # Xử lý từng page
             for page_num in range(1, total_pages + 1):
                 logger.info(f"--- Đang xử lý page {page_num}/{total_pages} ---")
@@ -1788,21 +2325,19 @@ class GofileRoomDownloader:
                     )
                     select_all_checkbox = headers_list[-1]
                     select_all_checkbox.click()
-                    time.sleep(1)
                     
                     # Click download button
                     download_document_btns = self.wait.until(
-                        EC.presence_of_all_elements_located(config.DOCUMENT_ACTION_BTNS_LOCALTOR)
+                        EC.visibility_of_all_elements_located(config.DOCUMENT_ACTION_BTNS_LOCALTOR)
                     )
                     download_document_btn = download_document_btns[0]
                     download_document_btn.click()
-                    time.sleep(1)
                     
                     # Thử click export button, nếu không được thì chuyển sang export từng file
                     try:
                         # Click export button
                         export_document_btns = self.wait.until(
-                            EC.presence_of_all_elements_located(config.EXPORT_DOCUMENT_BTNS_LOCALTOR)
+                            EC.visibility_of_all_elements_located(config.EXPORT_DOCUMENT_BTNS_LOCALTOR)
                         )
                         export_document_btn = export_document_btns[0]
                         
@@ -1812,11 +2347,9 @@ class GofileRoomDownloader:
                             raise Exception("Export button bị disable")
                         
                         export_document_btn.click()
-                        time.sleep(1)
                         
                     except (TimeoutException, NoSuchElementException, Exception) as e:
-                        download_document_btn.click()
-                        select_all_checkbox.click()
+                        self._reset_bulk_selection(download_document_btn, select_all_checkbox)
                         error_msg = f"Không thể click export button cho page {page_num}: {str(e)}"
                         logger.warning(error_msg)
                         logger.info(f"Chuyển sang export từng file riêng lẻ cho page {page_num}")
@@ -1834,9 +2367,8 @@ class GofileRoomDownloader:
                                     EC.element_to_be_clickable(config.NEXT_PAGE_BTN_LOCATOR)
                                 )
                                 if 'disabled' not in next_page_btn.get_attribute('class'):
-                                    next_page_btn.click()
+                                    self._click_next_page(next_page_btn)
                                     logger.info(f"Đã chuyển sang page {page_num + 1}")
-                                    time.sleep(4)
                                 else:
                                     logger.warning("Nút next page bị disable")
                                     break
@@ -1851,9 +2383,9 @@ class GofileRoomDownloader:
                         EC.element_to_be_clickable(config.OK_BTN_LOCALTOR)
                     )
                     btn_ok.click()
-                    time.sleep(15)
+                    # Chờ browser bắt đầu tải zip trước khi bỏ chọn và chuyển page
+                    self._wait_until(self._file_appeared_in_download_dir(".zip"), timeout=15)
                     select_all_checkbox.click()
-                    time.sleep(2)
                     # Chuyển sang page tiếp theo (nếu chưa phải page cuối)
                     if page_num < total_pages:
                         try:
@@ -1861,9 +2393,8 @@ class GofileRoomDownloader:
                                 EC.element_to_be_clickable(config.NEXT_PAGE_BTN_LOCATOR)
                             )
                             if 'disabled' not in next_page_btn.get_attribute('class'):
-                                next_page_btn.click()
+                                self._click_next_page(next_page_btn)
                                 logger.info(f"Đã chuyển sang page {page_num + 1}")
-                                time.sleep(4)
                             else:
                                 logger.warning("Nút next page bị disable")
                                 break
@@ -1890,30 +2421,14 @@ class GofileRoomDownloader:
                     # Move zip vào 0_zip_/client_name_client_number_zip/
                     zip_filename = os.path.basename(zip_file_path)
                     zip_dest_path = os.path.join(zip_client_folder_path, zip_filename)
-                    shutil.move(zip_file_path, zip_dest_path)
+                    replace_or_move(zip_file_path, zip_dest_path)
                     logger.info(f"Đã move zip vào: {zip_dest_path}")
                     
-                    # Giải nén zip
-                    try:
-                        with zipfile.ZipFile(zip_dest_path, 'r') as zip_ref:
-                            # Giải nén vào folder zip_client_folder_path
-                            zip_ref.extractall(zip_client_folder_path)
-                        logger.info(f"Đã giải nén zip: {zip_dest_path}")
-                        
-                        # Xóa file zip sau khi giải nén
-                        os.remove(zip_dest_path)
-                        
-                    except zipfile.BadZipFile:
-                        error_msg = f"Zip file bị hỏng: {zip_dest_path}"
-                        logger.error(error_msg)
-                        self.error_description = error_msg
-                        continue
-                    except Exception as e:
-                        error_msg = f"Lỗi khi giải nén zip: {str(e)}"
-                        logger.error(error_msg)
-                        logger.error(traceback.format_exc())
-                        self.error_description = error_msg
-                        continue
+                    # Giải nén zip ở background, browser tiếp tục tải page kế tiếp
+                    zip_futures.append((
+                        page_num,
+                        zip_executor.submit(self._postprocess_zip, zip_dest_path, zip_client_folder_path, move_state)
+                    ))
                     
                 except Exception as e:
                     error_msg = f"Lỗi khi xử lý page {page_num}: {str(e)}"
@@ -1922,117 +2437,79 @@ class GofileRoomDownloader:
                     self.error_description = error_msg
                     continue
             
-            # Sau khi tải xong tất cả các page, move từng file từ zip folder vào client folder
-            logger.info("Đang move files từ zip folder vào client folder...")
-            
-            for doc_id, doc_info in csv_documents_dict.items():
-                try:
-                    expected_file_name = doc_info.get("expected_download_file_name", "")
-                    doc_year = doc_info.get("Year", "").strip()
-                    
-                    # Tìm file trong zip folder (file có tên chứa document_id ở cuối)
-                    # Format: expected_name_document_id.ext
-                    found_file = None
-                    for root, dirs, files in os.walk(zip_client_folder_path):
-                        for file in files:
-                            # File từ zip có format: expected_name_document_id.ext
-                            if doc_id in file and expected_file_name.replace(".", f"_{doc_id}.") in file:
-                                found_file = os.path.join(root, file)
-                                break
-                        if found_file:
-                            break
-                    
-                    if not found_file:
-                        # Không tìm thấy file
-                        error_msg = f"Không tìm thấy file cho document_id {doc_id}"
-                        logger.warning(error_msg)
-                        row_index = doc_id_to_row_index.get(doc_id)
-                        if row_index:
-                            self.update_document_status_in_excel(
-                                doc_id, row_index, "Error", error_msg
-                            )
-                        continue
-                    
-                    # Xác định category folder dựa trên File Section, Document Type, Description
-                    file_section = doc_info.get("File Section", "").strip()
-                    document_type = doc_info.get("Document Type", "").strip()
-                    description = doc_info.get("Description", "").strip()
-                    category_folder = get_document_category(file_section, document_type, description)
-                    logger.info(f"Document {doc_id} category: {category_folder} (File Section: {file_section}, Document Type: {document_type})")
-                    
-                    # get category folder path
-                    category_dir = os.path.join(client_target_dir, category_folder)
-                    
-                    # get year folder path
-                    if doc_year:
-                        year_dir_status, year_dir = self._create_folder(doc_year, category_dir)
-                        if not year_dir_status:
-                            error_msg = f"Không thể tạo year folder: {doc_year}"
-                            logger.error(error_msg)
-                            row_index = doc_id_to_row_index.get(doc_id)
-                            if row_index:
-                                self.update_document_status_in_excel(
-                                    doc_id, row_index, "Error", error_msg
-                                )
-                            continue
-                        final_dest = os.path.join(year_dir, expected_file_name)
-                    else:
-                        final_dest = os.path.join(category_dir, expected_file_name)
-                    
-                    # Kiểm tra file đã tồn tại chưa
-                    if os.path.exists(final_dest):
-                        logger.info(f"File đã tồn tại: {final_dest}")
-                        self.downloaded_documents += 1
-                        download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        row_index = doc_id_to_row_index.get(doc_id)
-                        if row_index:
-                            self.update_document_status_in_excel(
-                                doc_id, row_index, "Success", "File already exists",
-                                expected_file_name, final_dest, download_time
-                            )
-                        # Xóa file trong zip folder
-                        try:
-                            os.remove(found_file)
-                        except:
-                            pass
-                        continue
-                    
-                    # Move file
+            # Chờ tất cả zip được giải nén xong và file đã được đưa sang move_executor
+            keep_zip_folder = False
+            for page_num, future in zip_futures:
+                success, error_msg = future.result()
+                if not success:
+                    logger.error(f"Page {page_num}: {error_msg}")
+                    self.error_description = error_msg
+                    keep_zip_folder = True
+            zip_executor.shutdown(wait=True)
+            
+            # File còn sót trong zip folder (vd: từ lần chạy trước) chưa được move
+            logger.info("Đang move các file còn lại từ zip folder vào client folder...")
+            dispatched_doc_ids = move_state["dispatched_doc_ids"]
+            leftover_files = [
+                file_path
+                for doc_id, file_path in self._index_zip_files_by_doc_id(zip_client_folder_path).items()
+                if doc_id not in dispatched_doc_ids
+            ]
+            self._dispatch_extracted_files(leftover_files, move_state)
+            
+            failed_doc_ids = move_state["failed_doc_ids"]
+            for doc_id in csv_documents_dict:
+                row_index = doc_id_to_row_index.get(doc_id)
+                if doc_id in failed_doc_ids:
+                    self._queue_document_status_update(doc_id, row_index, "Error", failed_doc_ids[doc_id])
+                elif doc_id not in dispatched_doc_ids:
+                    # Không tìm thấy file: giữ zip folder để kiểm tra/khôi phục thủ công
+                    error_msg = f"Không tìm thấy file cho document_id {doc_id}"
+                    logger.warning(error_msg)
+                    self._queue_document_status_update(doc_id, row_index, "Error", error_msg)
+                    keep_zip_folder = True
+            
+            # Cập nhật Excel theo thứ tự các file move xong
+            move_futures = move_state["move_futures"]
+            move_results = []
+            for move_future in as_completed(move_futures):
+                move_results.append((*move_futures[move_future], move_future.result()))
+            move_executor.shutdown(wait=True)
+            
+            files_to_remove = []
+            for doc_id, expected_file_name, found_file, final_dest, move_result in move_results:
+                status, description, download_time = move_result
+                row_index = doc_id_to_row_index.get(doc_id)
+                if description == "File already exists":
+                    files_to_remove.append(found_file)
+                if status == "Success":
+                    self.downloaded_documents += 1
+                    self._queue_document_status_update(
+                        doc_id, row_index, status, description,
+                        expected_file_name, final_dest, download_time
+                    )
+                else:
+                    keep_zip_folder = True
+                    self._queue_document_status_update(doc_id, row_index, status, description)
+            
+            # Còn file chưa khớp document nào (tên sai, không có id...) thì cũng giữ folder
+            if not keep_zip_folder and self._has_unmatched_zip_files(zip_client_folder_path, files_to_remove):
+                logger.warning(f"Còn file chưa khớp document trong zip folder, giữ lại: {zip_client_folder_path}")
+                keep_zip_folder = True
+            
+            # Dọn zip folder một lần: xóa cả folder nếu mọi zip giải nén, mọi file move được
+            # và không còn file nào chưa khớp; ngược lại giữ folder và chỉ xóa các file trùng
+            if not keep_zip_folder:
+                shutil.rmtree(zip_client_folder_path, ignore_errors=True)
+            else:
+                for file_path in files_to_remove:
                     try:
-                        shutil.move(found_file, final_dest)
-                        logger.info(f"Đã move file: {final_dest}")
-                        self.downloaded_documents += 1
-                        
-                        # Cập nhật Excel
-                        download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        row_index = doc_id_to_row_index.get(doc_id)
-                        if row_index:
-                            self.update_document_status_in_excel(
-                                doc_id, row_index, "Success", "File downloaded successfully",
-                                expected_file_name, final_dest, download_time
-                            )
-                    except Exception as e:
-                        error_msg = f"Lỗi khi move file: {str(e)}"
-                        logger.error(error_msg)
-                        logger.error(traceback.format_exc())
-                        row_index = doc_id_to_row_index.get(doc_id)
-                        if row_index:
-                            self.update_document_status_in_excel(
-                                doc_id, row_index, "Error", error_msg
-                            )
-                        continue
-                        
-                except Exception as e:
-                    error_msg = f"Lỗi khi xử lý document {doc_id}: {str(e)}"
-                    logger.error(error_msg)
-                    logger.error(traceback.format_exc())
-                    row_index = doc_id_to_row_index.get(doc_id)
-                    if row_index:
-                        self.update_document_status_in_excel(
-                            doc_id, row_index, "Error", error_msg
-                        )
-                    continue
+                        os.remove(file_path)
+                    except OSError:
+                        pass
             
+            # Ghi status của tất cả documents vào Excel một lần
+            self._flush_document_status_updates()
             logger.info(f"Hoàn thành export multiple: {self.downloaded_documents}/{total_documents} files")
             return True
             
@@ -2041,8 +2518,209 @@ class GofileRoomDownloader:
             logger.error(error_msg)
             logger.error(traceback.format_exc())
             self.error_description = error_msg
+            self._flush_document_status_updates()
             return False
     
+    def _get_download_time(self):
+        """
+        Thời gian download dạng "%Y-%m-%d %H:%M:%S", chỉ format lại khi sang giây mới
+        (tránh datetime.now().strftime cho từng document)
+        """
+        now_second = int(time.time())
+        cached_second, cached_text = self._download_time_cache
+        if now_second != cached_second:
+            cached_text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now_second))
+            self._download_time_cache = (now_second, cached_text)
+        return cached_text
+    
+    def _move_extracted_file(self, found_file, final_dest, dest_exists=False):
+        """
+        Move một file đã giải nén vào thư mục đích (chạy trong thread pool, không ghi Excel)
+        
+        Args:
+            found_file (str): Đường dẫn file trong zip folder
+            final_dest (str): Đường dẫn đích (category hoặc category/year folder)
+            dest_exists (bool): File đích đã tồn tại (theo snapshot của thư mục đích)
+            
+        Returns:
+            tuple: (status: str, description: str, download_time: str)
+        """
+        # Kiểm tra file đã tồn tại chưa (file trong zip folder được dọn sau khi move xong)
+        if dest_exists:
+            logger.info(f"File đã tồn tại: {final_dest}")
+            return "Success", "File already exists", self._get_download_time()
+        
+        try:
+            replace_or_move(found_file, final_dest)
+            logger.info(f"Đã move file: {final_dest}")
+            return "Success", "File downloaded successfully", self._get_download_time()
+        except Exception as e:
+            error_msg = f"Lỗi khi move file: {str(e)}"
+            logger.error(error_msg)
+            logger.error(traceback.format_exc())
+            return "Error", error_msg, ""
+    
+    def _dispatch_extracted_files(self, file_paths, move_state):
+        """
+        Xác định thư mục đích cho các file đã giải nén và đưa việc move sang move_executor
+        (chỉ được gọi từ một thread tại một thời điểm: zip worker, hoặc main thread sau khi zip worker xong)
+        
+        Args:
+            file_paths (list): Đường dẫn các file đã giải nén (format: expected_name_document_id.ext)
+            move_state (dict): Trạng thái move của client (xem export_multiple)
+        """
+        csv_documents_dict = move_state["csv_documents_dict"]
+        year_dir_cache = move_state["year_dir_cache"]
+        dispatched_doc_ids = move_state["dispatched_doc_ids"]
+        
+        for found_file in file_paths:
+            match = self.ZIP_FILE_DOC_ID_PATTERN.search(os.path.basename(found_file))
+            if not match:
+                continue
+            doc_id = match.group(1)
+            doc_info = csv_documents_dict.get(doc_id)
+            if doc_info is None or doc_id in dispatched_doc_ids:
+                continue
+            dispatched_doc_ids.add(doc_id)
+            
+            try:
+                expected_file_name = doc_info.get("expected_download_file_name", "")
+                doc_year = doc_info.get("Year", "").strip()
+                
+                # Xác định category folder dựa trên File Section, Document Type, Description
+                file_section = doc_info.get("File Section", "").strip()
+                document_type = doc_info.get("Document Type", "").strip()
+                description = doc_info.get("Description", "").strip()
+                category_folder = get_document_category(file_section, document_type, description)
+                logger.info(f"Document {doc_id} category: {category_folder} (File Section: {file_section}, Document Type: {document_type})")
+                
+                # get category/year folder path (chỉ tạo và quét folder lần đầu gặp cặp này)
+                cached_dir = year_dir_cache.get((category_folder, doc_year))
+                if cached_dir is None:
+                    category_dir = os.path.join(move_state["client_target_dir"], category_folder)
+                    dest_dir = os.path.join(category_dir, doc_year) if doc_year else category_dir
+                    try:
+                        os.makedirs(dest_dir, exist_ok=True)
+                        with os.scandir(dest_dir) as entries:
+                            existing_names = {entry.name for entry in entries}
+                    except OSError as e:
+                        error_msg = f"Không thể tạo year folder: {doc_year} ({str(e)})"
+                        logger.error(error_msg)
+                        move_state["failed_doc_ids"][doc_id] = error_msg
+                        continue
+                    cached_dir = (dest_dir, existing_names)
+                    year_dir_cache[(category_folder, doc_year)] = cached_dir
+                dest_dir, existing_names = cached_dir
+                final_dest = os.path.join(dest_dir, expected_file_name)
+                
+                # Kiểm tra file đã tồn tại bằng snapshot của folder (không stat từng file),
+                # đánh dấu tên file ngay để document trùng đích được coi là đã tồn tại
+                dest_exists = expected_file_name in existing_names
+                existing_names.add(expected_file_name)
+                move_future = move_state["move_executor"].submit(
+                    self._move_extracted_file, found_file, final_dest, dest_exists
+                )
+                move_state["move_futures"][move_future] = (doc_id, expected_file_name, found_file, final_dest)
+                
+            except Exception as e:
+                error_msg = f"Lỗi khi xử lý document {doc_id}: {str(e)}"
+                logger.error(error_msg)
+                logger.error(traceback.format_exc())
+                move_state["failed_doc_ids"][doc_id] = error_msg
+    
+    def _postprocess_zip(self, zip_dest_path, zip_client_folder_path, move_state=None):
+        """
+        Giải nén zip của một page, xóa file zip và đưa các file đã giải nén sang move_executor
+        (chạy ở background thread)
+        
+        Args:
+            zip_dest_path (str): Đường dẫn file zip đã move vào zip folder
+            zip_client_folder_path (str): Thư mục giải nén
+            move_state (dict): Trạng thái move của client, None nếu chỉ giải nén
+            
+        Returns:
+            tuple: (success: bool, error_msg: str)
+        """
+        try:
+            extracted_files = extract_zip_parallel(zip_dest_path, zip_client_folder_path)
+            logger.info(f"Đã giải nén zip: {zip_dest_path}")
+            
+            # Xóa file zip sau khi giải nén
+            os.remove(zip_dest_path)
+            
+            if move_state is not None:
+                self._dispatch_extracted_files(extracted_files, move_state)
+            return True, ""
+            
+        except ZipFileError as e:
+            error_msg = f"Zip file bị hỏng hoặc không giải nén được: {zip_dest_path} ({str(e)})"
+            logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Lỗi khi giải nén zip: {str(e)}"
+            logger.error(error_msg)
+            logger.error(traceback.format_exc())
+            return False, error_msg
+    
+    # File từ zip có format: expected_name_document_id.ext
+    ZIP_FILE_DOC_ID_PATTERN = re.compile(r'_([^_]+)\.[^.]+$')
+    
+    def _has_unmatched_zip_files(self, zip_client_folder_path, files_to_remove):
+        """
+        Kiểm tra zip folder còn file nào chưa được move (ngoài các file trùng sẽ bị xóa)
+        
+        Args:
+            zip_client_folder_path (str): Thư mục đã giải nén các zip của client
+            files_to_remove (list): Các file trùng (đích đã tồn tại), được phép xóa
+            
+        Returns:
+            bool: True nếu còn file chưa khớp document (hoặc không đọc được folder)
+        """
+        removable_files = {os.path.normcase(file_path) for file_path in files_to_remove}
+        pending_dirs = [zip_client_folder_path]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif os.path.normcase(entry.path) not in removable_files:
+                            return True
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Không thể đọc folder {current_dir}: {str(e)}")
+                return True
+        return False
+    
+    def _index_zip_files_by_doc_id(self, zip_client_folder_path):
+        """
+        Quét zip folder (kể cả subfolder) một lần và index file theo document_id ở cuối tên file
+        
+        Args:
+            zip_client_folder_path (str): Thư mục đã giải nén các zip của client
+            
+        Returns:
+            dict: document_id -> đường dẫn file
+        """
+        files_by_doc_id = {}
+        pending_dirs = [zip_client_folder_path]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                            continue
+                        match = self.ZIP_FILE_DOC_ID_PATTERN.search(entry.name)
+                        if match:
+                            files_by_doc_id.setdefault(match.group(1), entry.path)
+            except OSError as e:
+                logger.warning(f"Không thể đọc folder {current_dir}: {str(e)}")
+        return files_by_doc_id
+    
     def _reload_page(self):
         """Reload trang hiện tại"""
         try:
@@ -2055,6 +2733,16 @@ class GofileRoomDownloader:
             logger.error(f"Lỗi khi reload trang: {str(e)}")
             return False
     
+    # Keyword của lỗi web, compile một lần thành regex không phân biệt hoa thường
+    WEB_ERROR_PATTERN = re.compile(
+        "|".join(re.escape(keyword) for keyword in [
+            "timeout", "timed out", "element not found", "no such element",
+            "stale element", "element is not attached", "session not created",
+            "connection", "network", "webdriver", "selenium"
+        ]),
+        re.IGNORECASE
+    )
+    
     def _is_web_error(self, error_msg):
         """
         Kiểm tra xem lỗi có phải là lỗi web không (cần reload và retry)
@@ -2065,13 +2753,7 @@ class GofileRoomDownloader:
         Returns:
             bool: True nếu là lỗi web
         """
-        web_error_keywords = [
-            "timeout", "timed out", "element not found", "no such element",
-            "stale element", "element is not attached", "session not created",
-            "connection", "network", "webdriver", "selenium"
-        ]
-        error_lower = error_msg.lower()
-        return any(keyword in error_lower for keyword in web_error_keywords)
+        return self.WEB_ERROR_PATTERN.search(error_msg) is not None
     
     def process_client(self, client_info, max_retries=2):
         """
@@ -2149,13 +2831,16 @@ class GofileRoomDownloader:
                     self.error_description = error_msg
                     return False
                 
-                client_dir = "-".join([str(client_name), str(client_number)])
-                client_dir_status, client_target_dir = self._get_safe_client_dir(client_dir, self.download_dir, is_client_folder=True)
+                client_dir_status, client_target_dir = self._get_safe_client_dir(
+                    client_info['client_dir'], self.download_dir, is_client_folder=True
+                )
                 if not client_dir_status:
                     error_msg = "Không thể tạo client folder"
                     logger.error(error_msg)
                     self.error_description = error_msg
                     return False
+                # Lưu lại để run() không phải tạo lại client folder
+                client_info['client_folder_path'] = client_target_dir
                 
                 # Export documents
                 if self.total_documents == 1:
@@ -2198,12 +2883,14 @@ class GofileRoomDownloader:
                     # Không phải lỗi web hoặc đã hết retry
                     return False
     
+    SAVE_EVERY_N_CLIENTS = 10  # số client được xử lý giữa hai lần lưu Excel trong run()
+    
     def run(self, excel_file_path):
         """Chạy automation cho tất cả client"""
         try:
-            logger.info("=" * 80)
+            logger.info(LOG_SEPARATOR)
             logger.info("BẮT ĐẦU AUTOMATION")
-            logger.info("=" * 80)
+            logger.info(LOG_SEPARATOR)
             
             # Setup driver (chỉ 1 lần cho tất cả client)
             self.setup_driver()
@@ -2249,9 +2936,9 @@ class GofileRoomDownloader:
             error_summary = {}
             
             for idx, client_info in enumerate(client_list, 1):
-                logger.info(f"\n{'=' * 80}")
+                logger.info(f"\n{LOG_SEPARATOR}")
                 logger.info(f"Xử lý client {idx}/{total_count}: {client_info['client_name']}")
-                logger.info(f"{'=' * 80}\n")
+                logger.info(f"{LOG_SEPARATOR}\n")
                 
                 try:
                     # Process client
@@ -2319,13 +3006,19 @@ class GofileRoomDownloader:
                     client_info['num_files_downloaded_cell'].value = str(self.downloaded_documents)
                     
                     # Cập nhật client folder path
-                    client_dir = "-".join([str(client_info['client_name']), str(client_info['client_number'])])
-                    _, client_folder_path = self._get_safe_client_dir(client_dir, self.download_dir, is_client_folder=True)
+                    client_folder_path = client_info.get('client_folder_path')
+                    if client_folder_path is None:
+                        _, client_folder_path = self._get_safe_client_dir(
+                            client_info['client_dir'], self.download_dir, is_client_folder=True
+                        )
                     client_info['client_folder_path_cell'].value = client_folder_path
                     
-                    # Lưu Excel sau mỗi client
-                    self.excel_handler.save_workbook()
-                    logger.info(f"Đã lưu Excel sau khi xử lý client {idx}")
+                    # Lưu Excel sau mỗi SAVE_EVERY_N_CLIENTS client (và ở client cuối)
+                    self._dirty_since_save += 1
+                    if self._dirty_since_save >= self.SAVE_EVERY_N_CLIENTS or idx == total_count:
+                        self.excel_handler.save_workbook()
+                        self._dirty_since_save = 0
+                        logger.info(f"Đã lưu Excel sau khi xử lý client {idx}")
                     
                     # Nghỉ giữa các client
                     if idx < total_count:
@@ -2343,10 +3036,10 @@ class GofileRoomDownloader:
                         pass
                     continue
             
-            logger.info(f"\n{'=' * 80}")
+            logger.info(f"\n{LOG_SEPARATOR}")
             logger.info(f"HOÀN THÀNH AUTOMATION")
             logger.info(f"Thành công: {success_count}/{total_count}")
-            logger.info(f"{'=' * 80}\n")
+            logger.info(f"{LOG_SEPARATOR}\n")
             
         except Exception as e:
             logger.error(f"Lỗi tổng quát trong quá trình automation: {str(e)}")
@@ -2361,7 +3054,10 @@ class GofileRoomDownloader:
             self.cleanup()
     
     def cleanup(self):
-        """Dọn dẹp và đóng browser"""
+        """Dọn dẹp, lưu status document vào Excel, export log documents và đóng browser"""
+        saved = self._finalize_document_log()
+        # Chỉ xóa CSV sidecar khi status đã nằm trong Excel, nếu không lần chạy sau sẽ khôi phục từ CSV
+        self._export_document_log_workbook(remove_csv=saved)
         try:
             if self.driver:
                 self.driver.quit()
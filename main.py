@@ -4,13 +4,17 @@ Refactored version with new structure
 """
 
 import os
-import csv
 import re
 import time
 import logging
+import logging.handlers
+import queue
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from openpyxl import load_workbook
+import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -25,28 +29,35 @@ import config
 from document_mapping import get_document_category
 from file_handler import (
     rename_file_with_doc_id, move_file, move_csv_to_storage,
-    move_zip_to_storage, extract_zip, remove_file, find_file_in_zip_folder,
+    move_zip_to_storage, extract_zip_to_destinations, remove_file,
     wait_for_file_download, clean_download_dir, rename_csv_file,
     FileHandlerError, FileNotFoundError, FileOperationError, ZipFileError, FileDownloadTimeoutError
 )
-from excel_handler import ExcelHandler, ExcelHandlerError, ExcelHeaderError, ExcelOperationError, ExcelSaveError
-from models import Document, Client, BASE_DOWNLOAD_DIR
+from excel_handler import ExcelHandler, ThreadSafeExcelHandler, ExcelHandlerError, ExcelHeaderError, ExcelOperationError, ExcelSaveError
+from models import Document, Client, BASE_DOWNLOAD_DIR, invalidate_folder_cache
 from utils import resource_path, load_env_config
 from email_handler import create_email_handler_from_config
 
 # Setup logging
 log_file_name = 'gofileroom_download.log'
 log_file_path = resource_path(log_file_name)
+log_format = '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+log_file_handler = logging.FileHandler(log_file_path, encoding='utf-8', delay=True)
+log_file_handler.setFormatter(logging.Formatter(log_format))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
+    format=log_format,
     handlers=[
-        logging.FileHandler(log_file_path, encoding='utf-8'),
+        # Buffer file writes; WARNING and above (and exit) flush immediately
+        logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.WARNING, target=log_file_handler),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Document count in client tree item text (format: "Client Name | Number (count)")
+DOC_COUNT_PATTERN = re.compile(r'\((\d+)\)')
+
 
 # Custom Exceptions
 class GofileRoomDownloaderError(Exception):
@@ -80,8 +91,16 @@ class LoginError(GofileRoomDownloaderError):
 
 
 class GofileRoomDownloader:
-    def __init__(self):
-        """Initialize downloader"""
+    DEFAULT_DEBUGGER_PORT = 9222
+    
+    def __init__(self, debugger_port=DEFAULT_DEBUGGER_PORT):
+        """
+        Initialize downloader
+        
+        Args:
+            debugger_port (int): Remote debugging port of the running Chrome instance to connect to
+        """
+        self.debugger_port = debugger_port
         self.driver = None
         self.wait = None
         self.excel_handler = None
@@ -92,11 +111,28 @@ class GofileRoomDownloader:
         # Initialize email handler
         self.email_handler = create_email_handler_from_config(self.config)
         
-        # Download configuration
-        self.download_dir = BASE_DOWNLOAD_DIR
+        # Values from .env used on every client/page, parsed once
+        self.username = self.config.get('USERNAME')
+        self.items_per_page = int(self.config.get('NUMBER_ITEMS_PER_PAGE', 50))
+        # Retry count for file download timeouts (default: 3)
+        self.download_retry_count = max(1, int(self.config.get('DOWNLOAD_RETRY_COUNT', 3)))
+        
+        # Download configuration (each extra Chrome instance downloads into its own subfolder)
+        if debugger_port == self.DEFAULT_DEBUGGER_PORT:
+            self.download_dir = BASE_DOWNLOAD_DIR
+        else:
+            self.download_dir = os.path.join(BASE_DOWNLOAD_DIR, f"0_chrome_{debugger_port}_")
         self.csv_dir = os.path.join(self.download_dir, "0_csv_")
         self.zip_dir = os.path.join(self.download_dir, "0_zip_")
         
+        # Folders already created during this run (see _ensure_folder)
+        self._created_folders = set()
+        
+        # Background zip processing (see export_documents)
+        self._zip_executor = None
+        self._zip_futures = []
+        self._zip_sequence = 0
+        
         # Create necessary directories
         os.makedirs(self.download_dir, exist_ok=True)
         os.makedirs(self.csv_dir, exist_ok=True)
@@ -124,14 +160,24 @@ class GofileRoomDownloader:
             "safebrowsing.enabled": True
         }
         chrome_options.add_experimental_option("prefs", prefs)
-        chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+        chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{self.debugger_port}")
         
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         
-        logger.info("Successfully connected to running Chrome")
+        logger.info(f"Successfully connected to running Chrome (port {self.debugger_port})")
         
-        self.driver.implicitly_wait(config.IMPLICIT_WAIT)
+        # Prefs are ignored when attaching to a running Chrome, so set download folder via CDP
+        try:
+            self.driver.execute_cdp_cmd(
+                "Page.setDownloadBehavior",
+                {"behavior": "allow", "downloadPath": self.download_dir}
+            )
+        except Exception as e:
+            logger.warning(f"Unable to set Chrome download folder, using Chrome settings: {str(e)}")
+        
+        # No implicit wait: every wait is an explicit WebDriverWait, so failed lookups return immediately
+        self.driver.implicitly_wait(0)
         self.driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
         self.wait = WebDriverWait(self.driver, config.EXPLICIT_WAIT)
 
@@ -139,10 +185,22 @@ class GofileRoomDownloader:
         """Load home page, if redirected to login page then login again"""
         logger.info("Loading home page...")
         
-        # Check current URL
+        # Attached Chrome is often already on the home page: skip the reload if it is ready
+        if config.BASE_URL in self.driver.current_url:
+            try:
+                WebDriverWait(self.driver, 2).until(
+                    EC.presence_of_element_located(config.SEARCH_CLIENT_IFRAME_LOCATOR)
+                )
+                logger.info("Home page already loaded")
+                return
+            except TimeoutException:
+                logger.info("Home page is not ready, reloading...")
+        
+        # Check current URL (wait until the app settles on home page or login page)
         self.driver.get(config.BASE_URL)
-        time.sleep(5)
-        current_url = self.driver.current_url
+        current_url = self._wait_for_url(
+            lambda url: config.BASE_URL in url or config.LOGIN_URL in url
+        )
         logger.info(f"Current URL: {current_url}")
         
         # If on login page, perform login
@@ -153,16 +211,162 @@ class GofileRoomDownloader:
         # If not on home page, navigate to home page
         if config.BASE_URL not in current_url:
             self.driver.get(config.BASE_URL)
-            time.sleep(3)
             
             # Check again if redirected to login
-            current_url = self.driver.current_url
+            current_url = self._wait_for_url(
+                lambda url: config.BASE_URL in url or config.LOGIN_URL in url
+            )
             if config.LOGIN_URL in current_url:
                 logger.info("Redirected to login page after loading home page, performing login...")
                 self.login()
         
         logger.info("Successfully loaded home page")
 
+    def _wait_for_url(self, predicate, timeout=config.PAGE_LOAD_TIMEOUT):
+        """
+        Wait until the current URL satisfies predicate (instead of a fixed sleep)
+        
+        Args:
+            predicate (callable): Function taking the current URL and returning bool
+            timeout (int): Maximum wait time (seconds)
+            
+        Returns:
+            str: Current URL (when predicate is satisfied or timeout is reached)
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(lambda driver: predicate(driver.current_url))
+        except TimeoutException:
+            logger.warning(f"Timeout after {timeout}s waiting for URL, current URL: {self.driver.current_url}")
+        return self.driver.current_url
+    
+    def _ensure_folder(self, folder_path):
+        """
+        Create folder if needed, remembering created folders to skip repeated stat/mkdir calls
+        
+        Args:
+            folder_path (str): Folder path
+        """
+        if folder_path not in self._created_folders:
+            os.makedirs(folder_path, exist_ok=True)
+            self._created_folders.add(folder_path)
+    
+    def _wait_for(self, condition, timeout=config.EXPLICIT_WAIT):
+        """
+        Wait until condition is met (instead of a fixed sleep after a click)
+        
+        Args:
+            condition: Expected condition or callable taking driver
+            timeout (int): Maximum wait time (seconds)
+            
+        Returns:
+            Result of condition, None on timeout
+        """
+        try:
+            return WebDriverWait(self.driver, timeout).until(condition)
+        except TimeoutException:
+            logger.debug(f"Condition not met after {timeout}s, continuing")
+            return None
+    
+    def _retry_on_timeout(self, func, *args, backoff=10):
+        """
+        Call func(*args), retrying on FileDownloadTimeoutError up to DOWNLOAD_RETRY_COUNT times
+        Other errors are raised immediately
+        
+        Args:
+            func (callable): Download function to call
+            *args: Arguments for func
+            backoff (int): Wait time before retry (seconds)
+            
+        Returns:
+            Return value of func
+            
+        Raises:
+            FileDownloadTimeoutError: If every attempt timed out
+        """
+        for retry_attempt in range(self.download_retry_count):
+            try:
+                return func(*args)
+            except FileDownloadTimeoutError:
+                if retry_attempt < self.download_retry_count - 1:
+                    logger.warning(f"File download timeout (attempt {retry_attempt + 1}/{self.download_retry_count}). Retrying...")
+                    time.sleep(backoff)  # Wait before retry
+                else:
+                    logger.error(f"File download timeout after {self.download_retry_count} attempts")
+                    raise
+    
+    def _get_page_rows_summary(self):
+        """
+        Count document rows on current page with one execute_script call
+        (instead of returning every row element over WebDriver)
+        
+        Returns:
+            tuple: (row_count, first_row_text)
+        """
+        return self.driver.execute_script(
+            """
+            const rows = document.querySelectorAll(arguments[0]);
+            return [rows.length, rows.length ? rows[0].textContent : ''];
+            """,
+            f"{config.DOCUMENT_TABLE_CSS} {config.DOCUMENT_TABLE_ROW_CSS}"
+        )
+    
+    def _wait_for_document_rows(self, document_table):
+        """
+        Wait until document table has rendered its rows
+        
+        Args:
+            document_table: Document table element
+            
+        Returns:
+            list: Row elements (empty list if no row appears within EXPLICIT_WAIT)
+        """
+        try:
+            return self.wait.until(
+                lambda driver: document_table.find_elements(
+                    config.DOCUMENT_TABLE_DIV_LOCATOR[0],
+                    config.DOCUMENT_TABLE_DIV_LOCATOR[1]
+                )
+            )
+        except TimeoutException:
+            return []
+    
+    def _wait_for_page_rows_summary(self):
+        """
+        Wait until current page has document rows, then return its summary
+        
+        Returns:
+            tuple: (row_count, first_row_text), (0, '') if no row appears within EXPLICIT_WAIT
+        """
+        def page_has_rows(driver):
+            summary = self._get_page_rows_summary()
+            return summary if summary[0] > 0 else False
+        
+        try:
+            return self.wait.until(page_has_rows)
+        except TimeoutException:
+            return 0, ''
+    
+    def _wait_for_page_change(self, previous_first_row_text):
+        """
+        Wait until the document grid re-renders after switching page (instead of a fixed sleep)
+        
+        Args:
+            previous_first_row_text (str): Text of first row before clicking next page
+        """
+        try:
+            self.wait.until(lambda driver: self._get_page_rows_summary()[1] != previous_first_row_text)
+        except TimeoutException:
+            logger.warning("Document table did not change after switching page")
+    
+    def ensure_session(self):
+        """
+        Reuse the current browser session for the next client
+        Only reload home page and login again if the session was redirected to login page
+        """
+        if config.LOGIN_URL in self.driver.current_url:
+            logger.info("Session expired (redirected to login page), logging in again...")
+            self.load_home_page()
+    
     def _check_and_handle_login_redirect(self):
         """
         Check if redirected to login page, if so then login
@@ -185,8 +389,8 @@ class GofileRoomDownloader:
         """
         logger.info("Logging into GOFILEROOM...")
         
-        # Read username from config
-        username = self.config.get('USERNAME')
+        # Username from config (read in __init__)
+        username = self.username
         
         if not username:
             error_msg = "USERNAME not found in .env file"
@@ -215,7 +419,12 @@ class GofileRoomDownloader:
         username_input.clear()
         username_input.send_keys(username)
         logger.info(f"Entered username: {username}")
-        time.sleep(1)
+        try:
+            WebDriverWait(self.driver, 5).until(
+                lambda driver: username_input.get_attribute("value") == username
+            )
+        except TimeoutException:
+            logger.warning("Username input value not updated after 5 seconds")
         
         # Find and click Sign In button
         try:
@@ -242,12 +451,11 @@ class GofileRoomDownloader:
         sign_in_btn.click()
         logger.info("Clicked Sign In button")
         
-        # Wait 15s for automatic redirect to BASE_URL
-        logger.info("Waiting for redirect after login (15 seconds)...")
-        time.sleep(15)
+        # Wait for automatic redirect away from login page
+        logger.info("Waiting for redirect after login...")
+        current_url = self._wait_for_url(lambda url: config.LOGIN_URL not in url)
         
         # Check URL after login
-        current_url = self.driver.current_url
         logger.info(f"URL after login: {current_url}")
         
         if config.LOGIN_URL in current_url:
@@ -311,10 +519,9 @@ class GofileRoomDownloader:
             if not search_input.is_enabled():
                 try:
                     search_input.click()
-                    time.sleep(1)
                 except:
                     self.driver.execute_script("arguments[0].click();", search_input)
-                    time.sleep(1)
+                self.wait.until(EC.element_to_be_clickable(search_input))
             
             # Clear old content and enter client name
             search_input.clear()
@@ -322,44 +529,46 @@ class GofileRoomDownloader:
             search_input.send_keys(Keys.RETURN)
             
             logger.info(f"Entered client name '{client_object.client_name}' and pressed Enter")
-            time.sleep(2)
             
             # Wait for client tree root element
             client_tree_root = self.wait.until(
                 EC.presence_of_element_located(config.CLIENT_TREE_ROOT_LOCATOR)
             )
-            time.sleep(1)
             
-            client_list_ul = client_tree_root.find_element(By.XPATH, "./ul")
-            client_item_a_tags = client_list_ul.find_elements(By.TAG_NAME, "a")
-            
-            if not client_item_a_tags:
-                error_msg = "Client items not found in tree structure"
-                logger.warning(error_msg)
-                raise ClientNotFoundError(error_msg)
+            # Wait until the search result shows the matching client, then click it
+            # (one execute_script round-trip per poll instead of one per tree item)
+            find_and_click_client_js = """
+                const list = arguments[0].querySelector(':scope > ul');
+                if (!list) { return null; }
+                const target = arguments[1];
+                for (const a of list.querySelectorAll('a')) {
+                    const text = a.textContent.trim();
+                    if (text.toLowerCase().startsWith(target)) {
+                        a.click();
+                        return text;
+                    }
+                }
+                return null;
+            """
+            search_text = f"{client_object.client_name} | {client_object.client_number}".lower()
             
-            # Find matching client
-            client_item = None
-            for a_tag in client_item_a_tags:
-                a_tag_text = str(a_tag.text)
-                search_text = f"{client_object.client_name} | {client_object.client_number}".lower()
-                if a_tag_text.lower().startswith(search_text):
-                    client_item = a_tag
-                    break
+            try:
+                client_item_text = self.wait.until(
+                    lambda driver: driver.execute_script(find_and_click_client_js, client_tree_root, search_text)
+                )
+            except TimeoutException:
+                client_item_text = None
             
-            if not client_item:
+            if not client_item_text:
                 error_msg = f"Client '{client_object.client_name} | {client_object.client_number}' not found in tree structure"
                 logger.warning(error_msg)
                 raise ClientNotFoundError(error_msg)
             
-            # Click on client to load document list
-            client_item.click()
             logger.info("Clicked on client to load Document List")
-            time.sleep(2)
+            self.wait.until(EC.presence_of_element_located(config.DOCUMENT_TABLE_LOCATOR))
             
             # Get number of documents from text (format: "Client Name | Number (count)")
-            pattern = r'\((\d+)\)'
-            match = re.search(pattern, client_item.text)
+            match = DOC_COUNT_PATTERN.search(client_item_text)
             if match:
                 number_documents = int(match.group(1))
                 logger.info(f"Found client with {number_documents} documents")
@@ -417,6 +626,8 @@ class GofileRoomDownloader:
             client_object.csv_download_file_path = csv_dest_path
             
             # Create document objects and add to client object
+            rows_to_add = []
+            documents_to_add = []
             for doc_id, doc_info in documents_data.items():
                 document = Document(
                     document_id=doc_id,
@@ -434,7 +645,7 @@ class GofileRoomDownloader:
                 # Check if document already exists in document_list, if not then add it
                 client_object.add_document(document)
                 
-                # Add row to document log sheet (if not exists then add, if exists then skip)
+                # Collect rows for document log sheet (if not exists then add, if exists then skip)
                 if self.excel_handler:
                     # Check if document already exists in Excel
                     existing_row_index = self.excel_handler.get_document_row_index(
@@ -443,29 +654,39 @@ class GofileRoomDownloader:
                         document.document_id
                     )
                     
-                    # If not exists, add new row
+                    document.excel_row_index = existing_row_index
+                    
+                    # If not exists, queue new row
                     if not existing_row_index:
-                        try:
-                            row_index = self.excel_handler.add_document_row(
-                                document.document_id,
-                                document.client_name,
-                                document.client_object.client_number,
-                                file_name=document.document_name_with_id,
-                                file_section=document.file_section,
-                                document_type=document.document_type,
-                                description=document.description,
-                                year=document.year,
-                                document_date=document.document_date,
-                                file_size=document.file_size,
-                                file_type=document.file_type,
-                                folder_category=document.category_name
-                            )
-                            logger.debug(f"Added new document row to Excel: doc_id={document.document_id}, row={row_index}")
-                        except (ExcelHeaderError, ExcelOperationError) as e:
-                            logger.error(f"Error adding document row to Excel: {str(e)}")
-                    else:
+                        documents_to_add.append(document)
+                        rows_to_add.append({
+                            'doc_id': document.document_id,
+                            'client_name': document.client_name,
+                            'client_number': document.client_object.client_number,
+                            'file_name': document.document_name_with_id,
+                            'file_section': document.file_section,
+                            'doc_type': document.document_type,
+                            'description': document.description,
+                            'year': document.year,
+                            'doc_date': document.document_date,
+                            'file_size': document.file_size,
+                            'file_type': document.file_type,
+                            'folder_category': document.category_name,
+                        })
+                    elif logger.isEnabledFor(logging.DEBUG):
                         logger.debug(f"Document {document.document_id} already exists in Excel at row {existing_row_index}, skipping")
             
+            # Add all new rows to document log sheet in one batch
+            if self.excel_handler and rows_to_add:
+                try:
+                    new_row_indices = self.excel_handler.extend_document_rows(rows_to_add)
+                    # Keep row index on each document so later updates skip the lookup
+                    for document, row_index in zip(documents_to_add, new_row_indices):
+                        document.excel_row_index = row_index
+                    logger.debug(f"Added {len(rows_to_add)} new document rows to Excel")
+                except (ExcelHeaderError, ExcelOperationError) as e:
+                    logger.error(f"Error adding document rows to Excel: {str(e)}")
+            
             logger.info(f"Created {len(client_object.document_list)} document objects for client {client_object.client_name}")
             
         except (CSVExportError, FileDownloadTimeoutError, FileOperationError):
@@ -496,57 +717,54 @@ class GofileRoomDownloader:
             logger.error(error_msg)
             raise CSVExportError(error_msg)
         
-        documents_data = {}
-        
         try:
-            with open(csv_file_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                
-                # Read header
-                try:
-                    header = next(reader)
-                    header = [h.strip() for h in header]
-                    
-                    # Find column indices
-                    doc_id_index = header.index("Document ID")
-                    client_name_index = header.index("Client Name")
-                    client_number_index = header.index("Client Number")
-                    
-                except (StopIteration, ValueError) as e:
-                    raise CSVExportError(f"Error reading CSV header: {str(e)}") from e
-                
-                # Read data
-                try:
-                    first_data_row = next(reader)
-                except StopIteration:
-                    logger.warning("CSV file only has header, no data")
-                    return documents_data
-                
-                # Validate Client Name/Number from first row
-                actual_client_name = first_data_row[client_name_index].strip().strip('"')
-                actual_client_number = first_data_row[client_number_index].strip().strip('"')
-                
-                if actual_client_number != client_number_check:
-                    error_msg = (f"CSV file does not match client: "
-                               f"Expected '{client_name_check}'/'{client_number_check}', "
-                               f"Got '{actual_client_name}'/'{actual_client_number}'")
-                    logger.error(error_msg)
-                    raise CSVExportError(error_msg)
-                
-                # Read first row
-                doc_id = first_data_row[doc_id_index].strip().strip('"')
-                documents_data[doc_id] = {
-                    header[i]: first_data_row[i].strip().strip('"') for i in range(len(header))
-                }
-                
-                # Read remaining rows
-                for row in reader:
-                    if not row:
-                        continue
-                    doc_id = row[doc_id_index].strip().strip('"')
-                    documents_data[doc_id] = {
-                        header[i]: row[i].strip().strip('"') for i in range(len(header))
-                    }
+            # Parse in pandas' C tokenizer; all columns as str so IDs/numbers keep their text form
+            # memory_map lets the tokenizer read the file pages directly instead of through a Python buffer
+            df = pd.read_csv(
+                csv_file_path,
+                dtype=str,
+                keep_default_na=False,
+                skipinitialspace=True,
+                quotechar='"',
+                encoding='utf-8',
+                engine='c',
+                low_memory=False,
+                memory_map=True,
+            )
+            df.columns = df.columns.str.strip()
+            
+            missing_columns = [
+                column for column in ("Document ID", "Client Name", "Client Number")
+                if column not in df.columns
+            ]
+            if missing_columns:
+                raise CSVExportError(f"Error reading CSV header: missing columns {missing_columns}")
+            
+            if len(df) == 0:
+                logger.warning("CSV file only has header, no data")
+                return {}
+            
+            # Short/ragged rows leave NaN in missing trailing columns even with keep_default_na=False;
+            # strip whitespace then quotes like the previous csv-module reader
+            df = df.fillna('').apply(lambda column: column.str.strip().str.strip('"'))
+            
+            # Validate Client Name/Number from first row
+            actual_client_name = df.iloc[0]["Client Name"]
+            actual_client_number = df.iloc[0]["Client Number"]
+            
+            if actual_client_number != client_number_check:
+                error_msg = (f"CSV file does not match client: "
+                           f"Expected '{client_name_check}'/'{client_number_check}', "
+                           f"Got '{actual_client_name}'/'{actual_client_number}'")
+                logger.error(error_msg)
+                raise CSVExportError(error_msg)
+            
+            # Later rows win on duplicate Document ID, same as the previous row-by-row loop
+            documents_data = (
+                df.drop_duplicates(subset="Document ID", keep="last")
+                .set_index("Document ID", drop=False)
+                .to_dict(orient="index")
+            )
             
             logger.info(f"Read {len(documents_data)} documents from CSV")
             return documents_data
@@ -574,6 +792,10 @@ class GofileRoomDownloader:
             DocumentExportError: If there is an error exporting documents
             WebNavigationError: If redirected to login page
         """
+        # Zip post-processing of a page overlaps with exporting the next page (one worker keeps pages in order)
+        zip_executor = ThreadPoolExecutor(max_workers=1)
+        self._zip_executor = zip_executor
+        self._zip_futures = []
         try:
             logger.info(f"Starting export documents for client: {client_object.client_name}")
             
@@ -581,8 +803,7 @@ class GofileRoomDownloader:
             self._check_and_handle_login_redirect()
             
             # Calculate number of pages
-            number_items_per_page = int(self.config.get('NUMBER_ITEMS_PER_PAGE', 50))
-            total_pages = (client_object.max_total_documents + number_items_per_page - 1) // number_items_per_page
+            total_pages = (client_object.max_total_documents + self.items_per_page - 1) // self.items_per_page
             
             # Get document table
             document_table = self.wait.until(
@@ -600,52 +821,24 @@ class GofileRoomDownloader:
                 document_table = self.wait.until(
                     EC.presence_of_element_located(config.DOCUMENT_TABLE_LOCATOR)
                 )
-                document_rows = document_table.find_elements(
-                    config.DOCUMENT_TABLE_DIV_LOCATOR[0], 
-                    config.DOCUMENT_TABLE_DIV_LOCATOR[1]
-                )
+                row_count, first_row_text = self._wait_for_page_rows_summary()
                 
-                if len(document_rows) <= 0:
+                if row_count <= 0:
                     logger.warning("No document rows found in table")
                     break
                 
-                # Get retry count from config (default: 3)
-                download_retry_count = int(self.config.get('DOWNLOAD_RETRY_COUNT', 3))
-                
                 # If only 1 document, download single with retry
                 if client_object.max_total_documents == 1:
-                    for retry_attempt in range(download_retry_count):
-                        try:
-                            self.download_single_document_in_page(document_table, 0, client_object.document_list)
-                            break  # Success, exit retry loop
-                        except FileDownloadTimeoutError as e:
-                            if retry_attempt < download_retry_count - 1:
-                                logger.warning(f"File download timeout (attempt {retry_attempt + 1}/{download_retry_count}). Retrying...")
-                                time.sleep(10)  # Wait before retry
-                            else:
-                                logger.error(f"File download timeout after {download_retry_count} attempts")
-                                raise
-                        except Exception as e:
-                            # For other errors, don't retry, just raise
-                            raise
+                    self._retry_on_timeout(
+                        self.download_single_document_in_page, document_table, 0, client_object.document_list
+                    )
                     break  # Exit page loop after single document download
                 
                 # If multiple documents, try download multiple with retry
                 if client_object.max_total_documents > 1:
-                    for retry_attempt in range(download_retry_count):
-                        try:
-                            self.download_multiple_documents_in_page(document_table, client_object.document_list)
-                            break  # Success, exit retry loop
-                        except FileDownloadTimeoutError as e:
-                            if retry_attempt < download_retry_count - 1:
-                                logger.warning(f"File download timeout (attempt {retry_attempt + 1}/{download_retry_count}). Retrying...")
-                                time.sleep(10)  # Wait before retry
-                            else:
-                                logger.error(f"File download timeout after {download_retry_count} attempts")
-                                raise
-                        except Exception as e:
-                            # For other errors, don't retry, just raise
-                            raise
+                    self._retry_on_timeout(
+                        self.download_multiple_documents_in_page, document_table, client_object.document_list
+                    )
 
                 # Click next page button to load next page
                 if page_num < total_pages:
@@ -657,7 +850,7 @@ class GofileRoomDownloader:
                         if 'disabled' not in btn_class:
                             next_page_btn.click()
                             logger.info(f"Switched to page {page_num + 1}")
-                            time.sleep(4)
+                            self._wait_for_page_change(first_row_text)
                         else:
                             logger.warning("Next page button is disabled")
                             break
@@ -665,6 +858,9 @@ class GofileRoomDownloader:
                         logger.warning("Next page button not found")
                         break
             
+            # Wait for background zip processing of the last pages
+            self._drain_zip_futures()
+            
             logger.info(f"Completed export documents for client: {client_object.client_name}")
             
         except (DocumentExportError, WebNavigationError, FileDownloadTimeoutError, FileOperationError, FileNotFoundError, ZipFileError):
@@ -672,6 +868,31 @@ class GofileRoomDownloader:
         except Exception as e:
             error_msg = f"Error exporting documents: {str(e)}"
             raise DocumentExportError(error_msg) from e
+        finally:
+            # On error, still record pages whose zip was processed, then stop the worker
+            self._drain_zip_futures(raise_errors=False)
+            self._zip_executor = None
+            zip_executor.shutdown(wait=True)
+    
+    def _drain_zip_futures(self, raise_errors=True):
+        """
+        Wait for background zip processing and write its results to Excel
+        
+        Args:
+            raise_errors (bool): Raise the first error after all results are written (otherwise only log)
+        """
+        first_error = None
+        futures, self._zip_futures = self._zip_futures, []
+        for future in futures:
+            try:
+                self.excel_handler.bulk_update_document_rows(future.result())
+            except Exception as e:
+                if first_error is None:
+                    first_error = e
+                if not raise_errors:
+                    logger.error(f"Error processing zip in background: {str(e)}")
+        if first_error is not None and raise_errors:
+            raise first_error
     
     def download_multiple_documents_in_page(self, document_table, document_list):
         """
@@ -692,51 +913,52 @@ class GofileRoomDownloader:
                 EC.presence_of_all_elements_located(config.DOCUMENT_HEADERS_LOCATOR)
             )
             select_all_checkout = headers_list[-1]
-            select_all_checkout.click()
-            time.sleep(1)
             
-            # Click download multiple files
-            download_document_btns = self.wait.until(
-                EC.presence_of_all_elements_located(config.DOCUMENT_ACTION_BTNS_LOCALTOR)
+            # Select all and open the action menu in one round-trip (wait until the action menu is clickable)
+            download_document_btn = self.wait.until(
+                EC.element_to_be_clickable(config.DOCUMENT_ACTION_BTNS_LOCALTOR)
+            )
+            self.driver.execute_script(
+                "arguments[0].click(); arguments[1].click();", select_all_checkout, download_document_btn
             )
-            download_document_btn = download_document_btns[0]
-            download_document_btn.click()
-            time.sleep(1)
             
-            # Find export document button
-            export_document_btns = self.wait.until(
-                EC.presence_of_all_elements_located(config.EXPORT_DOCUMENT_BTNS_LOCALTOR)
+            # Find export document button (wait until the menu has opened)
+            export_document_btn = self.wait.until(
+                EC.visibility_of_element_located(config.EXPORT_DOCUMENT_BTNS_LOCALTOR)
             )
-            export_document_btn = export_document_btns[0]
             
-            # Check if button is disabled
-            btn_class = export_document_btn.get_attribute('class') or ''
-            if 'disabled' in btn_class:
+            # Check if button is disabled and click it in the same call
+            export_clicked = self.driver.execute_script(
+                "if ((arguments[0].getAttribute('class') || '').indexOf('disabled') !== -1) { return false; }"
+                " arguments[0].click(); return true;",
+                export_document_btn
+            )
+            if not export_clicked:
                 logger.warning("Export button is disabled, switching to download individual files")
-                download_document_btn.click()
-                select_all_checkout.click()
-                # Download individual files
-                document_rows = document_table.find_elements(
-                    config.DOCUMENT_TABLE_DIV_LOCATOR[0], 
-                    config.DOCUMENT_TABLE_DIV_LOCATOR[1]
+                # Close the action menu and unselect rows
+                self.driver.execute_script(
+                    "arguments[0].click(); arguments[1].click();", download_document_btn, select_all_checkout
                 )
-                for row_index in range(len(document_rows)):
+                # Download individual files
+                document_rows = self._wait_for_document_rows(document_table)
+                doc_by_id = {doc.document_id: doc for doc in document_list}
+                for row_index, row in enumerate(document_rows):
                     try:
-                        self.download_single_document_in_page(document_table, row_index, document_list)
-                        time.sleep(2) # Wait before downloading next document
+                        # Returns after the file has finished downloading, so the next export can start right away
+                        self.download_single_document_in_page(
+                            document_table, row_index, document_list, row=row, doc_by_id=doc_by_id
+                        )
                     except DocumentExportError as e:
                         logger.warning(f"Error downloading single document at row {row_index}: {str(e)}")
                 return  # Early return since already downloaded individual files
             
-            export_document_btn.click()
-            time.sleep(1)
-
             # Click OK button
             btn_ok = self.wait.until(
-                EC.presence_of_element_located(config.OK_BTN_LOCALTOR)
+                EC.element_to_be_clickable(config.OK_BTN_LOCALTOR)
             )
             btn_ok.click()
-            time.sleep(15)
+            # Wait until the export dialog has closed before unselecting rows
+            self._wait_for(EC.invisibility_of_element_located(config.OK_BTN_LOCALTOR), timeout=15)
             select_all_checkout.click()
             
             # Wait for zip file to download
@@ -750,80 +972,22 @@ class GofileRoomDownloader:
             # Move zip to 0_zip_ directory
             zip_dest_path = move_zip_to_storage(zip_file_path, self.zip_dir)
             
-            # Create client folder in 0_zip_ (only create once)
-            # Format: client_name_client_number_zip
-            zip_client_folder_name = f"{document_list[0].client_name}_{document_list[0].client_object.client_number}_zip"
-            zip_client_folder_path = os.path.join(self.zip_dir, zip_client_folder_name)
-            os.makedirs(zip_client_folder_path, exist_ok=True)
-            
-            extract_zip(zip_dest_path, zip_client_folder_path)
-            
-            # Remove zip file after extraction
-            remove_file(zip_dest_path)
-            
-            # Loop through each file in zip (after extraction)
-            # Files downloaded this way will have document id at the end
-            # Format: name_document_id.ext
-            if not os.path.exists(zip_client_folder_path):
-                error_msg = f"Zip folder does not exist: {zip_client_folder_path}"
-                logger.error(error_msg)
-                raise DocumentExportError(error_msg)
+            # Give the zip a unique name: the previous page's zip may still be processed in background
+            zip_base_path, zip_ext = os.path.splitext(zip_dest_path)
+            self._zip_sequence += 1
+            unique_zip_dest_path = f"{zip_base_path}_{self._zip_sequence}{zip_ext}"
+            os.replace(zip_dest_path, unique_zip_dest_path)
             
-            # Loop through all files in extracted zip folder
-            for root, dirs, files in os.walk(zip_client_folder_path):
-                for file_name in files:
-                    file_path = os.path.join(root, file_name)
-                    
-                    # Extract document_id from file name (file format: name_document_id.ext)
-                    # Find document_id in file name
-                    doc_id = None
-                    found_document_object = None
-                    for doc in document_list:
-                        # File from zip has format: expected_name_document_id.ext
-                        # Check if document_id is in file name
-                        if doc.document_id in file_name:
-                            doc_id = doc.document_id
-                            found_document_object = doc
-                            break
-                    
-                    if not doc_id or not found_document_object:
-                        logger.warning(f"Document ID or document object not found for doc_id: {doc_id}")
-                        continue
-                    
-                    # Check if file has correct name
-                    # Files extracted from zip don't need renaming, if name doesn't match then error
-                    expected_file_name = found_document_object.document_name_with_id
-                    if file_name.lower() != expected_file_name.lower():
-                        error_msg = f"File name mismatch: expected '{expected_file_name}', got '{file_name}'"
-                        logger.error(error_msg)
-                        found_document_object.set_download_status("Error", error_msg)
-                        continue
-                    
-                    # Move file to document_folder_path
-                    if not os.path.exists(found_document_object.document_folder_path):
-                        os.makedirs(found_document_object.document_folder_path, exist_ok=True)
-                    
-                    dest_path = found_document_object.document_file_path
-                    move_file(file_path, dest_path)
-                    
-                    # Update log in Excel
-                    download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    row_index = self.excel_handler.get_document_row_index(
-                        found_document_object.client_name, found_document_object.client_object.client_number, found_document_object.document_id
-                    )
-                    
-                    self.excel_handler.update_document_row(
-                        row_index,
-                        download_status="Success",
-                        download_desc="File downloaded successfully",
-                        file_name=found_document_object.document_name_with_id,
-                        file_path=dest_path,
-                        folder_category=found_document_object.category_name,
-                        download_time=download_time
-                    )
-                    
-                    found_document_object.set_download_status("Success", "File downloaded successfully", download_time)
-                    logger.info(f"Successfully downloaded document {found_document_object.document_id}")
+            if self._zip_executor is not None:
+                # Extract and move files in background while the next page is exported
+                self._zip_futures.append(
+                    self._zip_executor.submit(self._process_page_zip, unique_zip_dest_path, document_list)
+                )
+            else:
+                # Write all log updates for this page in one call (saved once per client in main)
+                self.excel_handler.bulk_update_document_rows(
+                    self._process_page_zip(unique_zip_dest_path, document_list)
+                )
 
         except (DocumentExportError, FileDownloadTimeoutError, FileOperationError, FileNotFoundError, ZipFileError):
             raise
@@ -831,7 +995,86 @@ class GofileRoomDownloader:
             error_msg = f"Error downloading multiple documents: {str(e)}"
             raise DocumentExportError(error_msg) from e
 
-    def download_single_document_in_page(self, document_table, row_index, document_list):
+    def _process_page_zip(self, zip_dest_path, document_list):
+        """
+        Extract a page zip straight into the document folders of the matched documents
+        May run in the zip worker thread, so Excel is not written here
+        
+        Args:
+            zip_dest_path (str): Zip file path in 0_zip_ directory
+            document_list: List of Document objects
+            
+        Returns:
+            list: Pending document row updates for excel_handler.bulk_update_document_rows
+        """
+        # Files that can't be matched to a document are extracted to client folder in 0_zip_
+        # Format: client_name_client_number_zip
+        zip_client_folder_name = f"{document_list[0].client_name}_{document_list[0].client_object.client_number}_zip"
+        zip_client_folder_path = os.path.join(self.zip_dir, zip_client_folder_name)
+        
+        doc_by_id = {doc.document_id: doc for doc in document_list}
+        matched_documents = []
+        # One timestamp for the page batch (files of one zip arrive together)
+        download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        def resolve_destination(file_name):
+            # Files downloaded this way will have document id at the end
+            # Format: name_document_id.ext
+            # Exact id lookup: a substring check would let id "12" match "name_1234.pdf"
+            # Id is the part after the last "_" of the name stem (string ops, no regex per file)
+            doc_id = None
+            found_document_object = None
+            name_stem, extension = os.path.splitext(file_name)
+            _, separator, candidate_id = name_stem.rpartition('_')
+            if extension and separator and candidate_id:
+                doc_id = candidate_id
+                found_document_object = doc_by_id.get(doc_id)
+            
+            if not doc_id or not found_document_object:
+                logger.warning(f"Document ID or document object not found for doc_id: {doc_id}")
+                return None
+            
+            # Check if file has correct name
+            # Files extracted from zip don't need renaming, if name doesn't match then error
+            expected_file_name = found_document_object.document_name_with_id
+            if file_name.lower() != found_document_object.document_name_with_id_lower:
+                error_msg = f"File name mismatch: expected '{expected_file_name}', got '{file_name}'"
+                logger.error(error_msg)
+                found_document_object.set_download_status("Error", error_msg, download_time)
+                return None
+            
+            self._ensure_folder(found_document_object.document_folder_path)
+            matched_documents.append(found_document_object)
+            return found_document_object.document_file_path
+        
+        extract_zip_to_destinations(zip_dest_path, resolve_destination, zip_client_folder_path)
+        for folder_path in {document.document_folder_path for document in matched_documents}:
+            invalidate_folder_cache(folder_path)
+        
+        # Remove zip file after extraction
+        remove_file(zip_dest_path)
+        
+        # Queue log updates for Excel
+        pending_updates = []
+        for found_document_object in matched_documents:
+            pending_updates.append({
+                'row_index': found_document_object.excel_row_index,
+                'download_status': "Success",
+                'download_desc': "File downloaded successfully",
+                'file_name': found_document_object.document_name_with_id,
+                'file_path': found_document_object.document_file_path,
+                'folder_category': found_document_object.category_name,
+                'download_time': download_time,
+            })
+            
+            found_document_object.set_download_status("Success", "File downloaded successfully", download_time)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Successfully downloaded document {found_document_object.document_id}")
+        
+        logger.info(f"Successfully downloaded {len(matched_documents)} documents from zip")
+        return pending_updates
+
+    def download_single_document_in_page(self, document_table, row_index, document_list, row=None, doc_by_id=None):
         """
         Download single document from a page
         
@@ -839,6 +1082,8 @@ class GofileRoomDownloader:
             document_table: Document table element
             row_index: Index of row to download
             document_list: List of Document objects
+            row: Row element already fetched by the caller (optional, avoids re-querying the table)
+            doc_by_id (dict): document_id -> Document built once by the caller (optional)
             
         Raises:
             DocumentExportError: If there is an error downloading single document
@@ -846,39 +1091,38 @@ class GofileRoomDownloader:
         try:
             logger.info(f"Downloading single document at row {row_index}...")
             
-            # Get document rows
-            document_rows = document_table.find_elements(
-                config.DOCUMENT_TABLE_DIV_LOCATOR[0], 
-                config.DOCUMENT_TABLE_DIV_LOCATOR[1]
-            )
-            
-            if row_index >= len(document_rows):
-                error_msg = f"Row index {row_index} exceeds number of rows"
-                logger.error(error_msg)
-                raise DocumentExportError(error_msg)
-            
-            row = document_rows[row_index]
+            # Get document row (unless the caller already has it)
+            if row is None:
+                document_rows = self._wait_for_document_rows(document_table)
+                
+                if row_index >= len(document_rows):
+                    error_msg = f"Row index {row_index} exceeds number of rows"
+                    logger.error(error_msg)
+                    raise DocumentExportError(error_msg)
+                
+                row = document_rows[row_index]
             
-            # Get document data cells
-            document_data_cells = row.find_elements(
-                config.DOCUMENT_DATA_CELL_LOCATOR[0], 
-                config.DOCUMENT_DATA_CELL_LOCATOR[1]
+            # Get document ID from row (one execute_script instead of fetching every cell)
+            row_doc_id = self.driver.execute_script(
+                "const cells = arguments[0].querySelectorAll(arguments[1]);"
+                "return cells.length > arguments[2] ? cells[arguments[2]].textContent.trim() : null;",
+                row, config.DOCUMENT_DATA_CELL_CSS, config.DOCUMENT_ID_CELL_INDEX
             )
             
-            if len(document_data_cells) < 10:
+            if row_doc_id is None:
                 error_msg = "Not enough cells found in document row"
                 logger.error(error_msg)
                 raise DocumentExportError(error_msg)
             
-            # Get document ID from row
-            row_doc_id = document_data_cells[9].text.strip()
-            
             # Find corresponding document object
-            document = None
-            for doc in document_list:
-                if doc.document_id == row_doc_id:
-                    document = doc
-                    break
+            if doc_by_id is not None:
+                document = doc_by_id.get(row_doc_id)
+            else:
+                document = None
+                for doc in document_list:
+                    if doc.document_id == row_doc_id:
+                        document = doc
+                        break
             
             if not document:
                 error_msg = f"Document object not found for doc_id: {row_doc_id}"
@@ -905,7 +1149,6 @@ class GofileRoomDownloader:
             btn_export = btns[2]
             btn_export.click()
             logger.info("Clicked export button")
-            time.sleep(5)
 
             # Wait for file to download
             downloaded_file_path = wait_for_file_download(self.download_dir, timeout=120)
@@ -914,7 +1157,7 @@ class GofileRoomDownloader:
             downloaded_file_name = os.path.basename(downloaded_file_path)
             expected_file_name = document.document_name_without_id
             
-            if downloaded_file_name.lower() != expected_file_name.lower():
+            if downloaded_file_name.lower() != document.document_name_without_id_lower:
                 error_msg = f"File name mismatch: expected '{expected_file_name}', got '{downloaded_file_name}'"
                 logger.error(error_msg)
                 document.set_download_status("Error", error_msg)
@@ -929,17 +1172,15 @@ class GofileRoomDownloader:
             renamed_file_path = rename_file_with_doc_id(downloaded_file_path, document.document_id)
             
             # Move file to document_folder_path
-            if not os.path.exists(document.document_folder_path):
-                os.makedirs(document.document_folder_path, exist_ok=True)
+            self._ensure_folder(document.document_folder_path)
             
             dest_path = document.document_file_path
             move_file(renamed_file_path, dest_path)
+            invalidate_folder_cache(document.document_folder_path)
             
             # Update log in Excel
             download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            row_index_excel = self.excel_handler.get_document_row_index(
-                document.client_name, document.client_object.client_number, document.document_id
-            )
+            row_index_excel = document.excel_row_index
             self.excel_handler.update_document_row(
                 row_index_excel,
                 download_status="Success",
@@ -960,6 +1201,229 @@ class GofileRoomDownloader:
             raise DocumentExportError(error_msg) from e
 
 
+def process_client(downloader, client_info):
+    """
+    Process one client: search_client, export_csv_file, export_documents and update client row
+    
+    Args:
+        downloader (GofileRoomDownloader): Downloader (browser session) used for this client
+        client_info (dict): Client info from excel_handler.get_client_list
+        
+    Returns:
+        dict: Error info (client_name, client_number, error) if processing failed, None otherwise
+    """
+    client_object = None
+    try:
+        logger.info(f"\n{'=' * 80}")
+        logger.info(f"Starting to process client: {client_info['client_name']} ({client_info['client_number']})")
+        logger.info(f"{'=' * 80}\n")
+        
+        # Delete all files in download_dir before processing new client
+        # (keep subdirectories like 0_csv_, 0_zip_)
+        clean_download_dir(downloader.download_dir)
+        
+        # Create client object
+        client_object = Client(client_info['client_name'], client_info['client_number'])
+        
+        # Reuse the same browser session, only login again if it has expired
+        downloader.ensure_session()
+        
+        # Perform search_client
+        downloader.search_client(client_object)
+        
+        # Initialize folders after client is successfully found
+        client_object.initialize_folders()
+        downloader.excel_handler.update_client_row(
+            client_info['row_index'],
+            status="InProgress",
+            description="Downloading documents...",
+            total_documents=client_object.max_total_documents,
+            num_files_downloaded=client_object.get_number_of_downloaded_documents(),
+            client_folder_path=client_object.client_folder_path
+        )
+
+        # Check number of documents
+        if client_object.max_total_documents == 0:
+            logger.warning(f"Client {client_info['client_name']} has no documents")
+            downloader.excel_handler.update_client_row(
+                client_info['row_index'],
+                status="Success",
+                description="Client has no document",
+                total_documents=0,
+                num_files_downloaded=0,
+                client_folder_path=client_object.client_folder_path
+            )
+            downloader.excel_handler.save_workbook()
+            return None
+        
+        # Perform export_csv_file
+        downloader.export_csv_file(client_object)
+        # Perform export_documents
+        downloader.export_documents(client_object)
+        
+        # Update status to success
+        if client_object.get_number_of_downloaded_documents() == client_object.max_total_documents:
+            c_status = "Success"
+            c_description = "Download client documents successfully"
+        else:
+            c_status = "Warning"
+            c_description = "Download client documents with some errors"
+            
+        downloader.excel_handler.update_client_row(
+            client_info['row_index'],
+            status=c_status,
+            description=c_description,
+            total_documents=client_object.max_total_documents,
+            num_files_downloaded=client_object.get_number_of_downloaded_documents(),
+            client_folder_path=client_object.client_folder_path
+        )
+        downloader.excel_handler.save_workbook()
+        
+        logger.info(f"Completed processing client: {client_info['client_name']}")
+        
+        return None
+        
+    except Exception as e:
+        error_msg = f"Error processing client {client_info['client_name']}: {str(e)}"
+        logger.error(error_msg)
+        logger.error(traceback.format_exc())
+        
+        if client_object is None:
+            client_object = Client(client_info['client_name'], client_info['client_number'])
+        downloader.excel_handler.update_client_row(
+            client_info['row_index'],
+            status="Error",
+            description=error_msg,
+            total_documents=client_object.max_total_documents,
+            num_files_downloaded=client_object.get_number_of_downloaded_documents(),
+            client_folder_path=client_object.client_folder_path
+        )
+        downloader.excel_handler.save_workbook()
+        
+        return {
+            'client_name': client_info['client_name'],
+            'client_number': client_info['client_number'],
+            'error': error_msg
+        }
+
+
+def process_client_queue(downloader, run_state):
+    """
+    Take clients from run_state['client_queue'] and process them with downloader until the queue is empty
+    Stop all workers when the number of consecutive client errors reaches max_consecutive_errors
+    
+    Args:
+        downloader (GofileRoomDownloader): Downloader (browser session) owned by this worker
+        run_state (dict): State shared by all workers (client_queue, lock, stop_event, error counters)
+    """
+    while not run_state['stop_event'].is_set():
+        try:
+            client_info = run_state['client_queue'].get_nowait()
+        except queue.Empty:
+            return
+        
+        error = process_client(downloader, client_info)
+        
+        with run_state['lock']:
+            if error is None:
+                # Reset consecutive errors on success
+                run_state['consecutive_errors'] = 0
+                run_state['error_summary'] = []
+                continue
+            
+            run_state['consecutive_errors'] += 1
+            run_state['error_summary'].append(error)
+            consecutive_errors = run_state['consecutive_errors']
+            max_consecutive_errors = run_state['max_consecutive_errors']
+            
+            # Check consecutive errors
+            if consecutive_errors >= max_consecutive_errors and not run_state['stop_event'].is_set():
+                run_state['stop_event'].set()
+                logger.critical(f"Found {consecutive_errors} consecutive client errors, stopping automation and sending email")
+                if downloader.email_handler:
+                    downloader.email_handler.send_critical_error_email(consecutive_errors, {
+                        'total_errors': consecutive_errors,
+                        'errors': run_state['error_summary'][-max_consecutive_errors:]
+                    })
+
+
+def load_excel_handler(excel_file_path, env_config):
+    """
+    Load client list workbook and initialize ExcelHandler (reads client list and document log)
+    
+    Args:
+        excel_file_path (str): Excel file path
+        env_config (dict): Config from .env file (sheet names)
+        
+    Returns:
+        ExcelHandler: Handler, None if a required sheet does not exist
+        
+    Raises:
+        ExcelHandlerError: If workbook cannot be loaded
+    """
+    # Load workbook and initialize ExcelHandler
+    # Try loading with data_only and keep_links=False to avoid XML parsing issues
+    workbook = None
+    try:
+        workbook = load_workbook(
+            excel_file_path,
+            data_only=True,  # Only read values, ignore formulas
+            keep_links=False  # Don't keep external links
+        )
+        logger.info("Successfully loaded workbook with data_only=True")
+    except (ValueError, Exception) as e:
+        # If fails, try with read_only mode as fallback
+        logger.warning(f"Failed to load workbook with data_only=True: {str(e)}")
+        logger.warning("Trying to load with read_only=True as fallback...")
+        try:
+            workbook = load_workbook(
+                excel_file_path,
+                read_only=True  # Read-only mode, may help with corrupted files
+            )
+            logger.info("Successfully loaded workbook with read_only=True")
+            logger.warning("Note: Workbook is in read-only mode. Saving may not work properly.")
+        except Exception as e2:
+            error_msg = f"Unable to read workbook: {str(e2)}"
+            logger.error(error_msg)
+            logger.error("This is most probably because the workbook source files contain some invalid XML.")
+            logger.error("Possible causes:")
+            logger.error("1. File Excel is corrupted")
+            logger.error("2. File Excel has VBA macros or unsupported features")
+            logger.error("3. File Excel is currently open in Excel application")
+            logger.error("4. File Excel has invalid table structures")
+            logger.error("")
+            logger.error("Solutions:")
+            logger.error("1. Close Excel if it's open")
+            logger.error("2. Try opening the file in Excel and save it again (File > Save As > Excel Workbook)")
+            logger.error("3. Try creating a new Excel file and copy data manually")
+            logger.error("4. Check if file is not corrupted")
+            logger.error("5. Remove any VBA macros or unsupported features from the file")
+            raise ExcelHandlerError(error_msg) from e2
+    
+    if workbook is None:
+        error_msg = "Failed to load workbook: Unknown error"
+        logger.error(error_msg)
+        raise ExcelHandlerError(error_msg)
+    client_list_sheet_name = env_config.get('CLIENT_LIST_SHEET_NAME', 'Client List GFR')
+    document_list_sheet_name = env_config.get('DOCUMENT_LIST_SHEET_NAME', 'Download Document Log')
+    
+    if client_list_sheet_name not in workbook.sheetnames:
+        logger.error(f"Sheet '{client_list_sheet_name}' does not exist in Excel file")
+        return None
+    
+    if document_list_sheet_name not in workbook.sheetnames:
+        logger.error(f"Sheet '{document_list_sheet_name}' does not exist in Excel file")
+        return None
+    
+    client_list_sheet = workbook[client_list_sheet_name]
+    document_list_sheet = workbook[document_list_sheet_name]
+    
+    # Initialize ExcelHandler
+    return ExcelHandler(
+        workbook, client_list_sheet, document_list_sheet, excel_file_path
+    )
+
+
 def main():
     """
     Initialize GofileRoomDownloader object, setup driver, login
@@ -975,76 +1439,34 @@ def main():
             - Perform export_csv_file
             - Perform export_documents
     """
+    extra_workers = []
     try:
-        # Initialize GofileRoomDownloader
-        downloader = GofileRoomDownloader()
-        
-        # Check if Excel file exists
-        if not os.path.exists(downloader.excel_file_path):
-            logger.error(f"Excel file does not exist: {downloader.excel_file_path}")
+        # Check if Excel file exists (before connecting to Chrome)
+        env_config = load_env_config(raise_on_not_found=True)
+        excel_file_path = resource_path(env_config.get('CLIENT_LIST_FILE_NAME', 'download_gofileroom_data.xlsx'))
+        if not os.path.exists(excel_file_path):
+            logger.error(f"Excel file does not exist: {excel_file_path}")
             return
         
-        # Load workbook and initialize ExcelHandler
-        # Try loading with data_only and keep_links=False to avoid XML parsing issues
-        workbook = None
-        try:
-            workbook = load_workbook(
-                downloader.excel_file_path,
-                data_only=True,  # Only read values, ignore formulas
-                keep_links=False  # Don't keep external links
-            )
-            logger.info("Successfully loaded workbook with data_only=True")
-        except (ValueError, Exception) as e:
-            # If fails, try with read_only mode as fallback
-            logger.warning(f"Failed to load workbook with data_only=True: {str(e)}")
-            logger.warning("Trying to load with read_only=True as fallback...")
+        # Initialize GofileRoomDownloader (connect Chrome, login) in background
+        # while the workbook is parsed, since both take seconds
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            downloader_future = executor.submit(GofileRoomDownloader)
             try:
-                workbook = load_workbook(
-                    downloader.excel_file_path,
-                    read_only=True  # Read-only mode, may help with corrupted files
-                )
-                logger.info("Successfully loaded workbook with read_only=True")
-                logger.warning("Note: Workbook is in read-only mode. Saving may not work properly.")
-            except Exception as e2:
-                error_msg = f"Unable to read workbook: {str(e2)}"
-                logger.error(error_msg)
-                logger.error("This is most probably because the workbook source files contain some invalid XML.")
-                logger.error("Possible causes:")
-                logger.error("1. File Excel is corrupted")
-                logger.error("2. File Excel has VBA macros or unsupported features")
-                logger.error("3. File Excel is currently open in Excel application")
-                logger.error("4. File Excel has invalid table structures")
-                logger.error("")
-                logger.error("Solutions:")
-                logger.error("1. Close Excel if it's open")
-                logger.error("2. Try opening the file in Excel and save it again (File > Save As > Excel Workbook)")
-                logger.error("3. Try creating a new Excel file and copy data manually")
-                logger.error("4. Check if file is not corrupted")
-                logger.error("5. Remove any VBA macros or unsupported features from the file")
-                raise ExcelHandlerError(error_msg) from e2
-        
-        if workbook is None:
-            error_msg = "Failed to load workbook: Unknown error"
-            logger.error(error_msg)
-            raise ExcelHandlerError(error_msg)
-        client_list_sheet_name = downloader.config.get('CLIENT_LIST_SHEET_NAME', 'Client List GFR')
-        document_list_sheet_name = downloader.config.get('DOCUMENT_LIST_SHEET_NAME', 'Download Document Log')
-        
-        if client_list_sheet_name not in workbook.sheetnames:
-            logger.error(f"Sheet '{client_list_sheet_name}' does not exist in Excel file")
-            return
+                excel_handler = load_excel_handler(excel_file_path, env_config)
+            except Exception:
+                # Excel error is the root cause: wait for the setup but don't let its error replace it
+                # (keep the downloader so finally quits its driver and the error email can be sent)
+                try:
+                    downloader = downloader_future.result()
+                except Exception as e:
+                    logger.error(f"Error initializing downloader: {str(e)}")
+                raise
+            downloader = downloader_future.result()
         
-        if document_list_sheet_name not in workbook.sheetnames:
-            logger.error(f"Sheet '{document_list_sheet_name}' does not exist in Excel file")
+        if excel_handler is None:
             return
-        
-        client_list_sheet = workbook[client_list_sheet_name]
-        document_list_sheet = workbook[document_list_sheet_name]
-        
-        # Initialize ExcelHandler
-        downloader.excel_handler = ExcelHandler(
-            workbook, client_list_sheet, document_list_sheet, downloader.excel_file_path
-        )
+        downloader.excel_handler = excel_handler
         
         # Get client list from excel_handler (only get status = "Pending")
         client_list = downloader.excel_handler.get_client_list(status_filter="Pending")
@@ -1056,111 +1478,39 @@ def main():
         logger.info(f"Found {len(client_list)} clients with status = Pending")
         
         # Loop to process each client
-        consecutive_errors = 0
         max_consecutive_errors = int(downloader.config.get('MAX_CONSECUTIVE_ERRORS', 10))
-        error_summary = []
         
+        # Optional: extra Chrome instances (one debugger port each) to process clients in parallel
+        extra_ports = [
+            int(port) for port in str(downloader.config.get('EXTRA_CHROME_DEBUGGER_PORTS', '') or '').split(',')
+            if port.strip()
+        ]
+        if extra_ports:
+            downloader.excel_handler = ThreadSafeExcelHandler(downloader.excel_handler)
+            for port in extra_ports:
+                worker = GofileRoomDownloader(debugger_port=port)
+                worker.excel_handler = downloader.excel_handler
+                extra_workers.append(worker)
+        
+        workers = [downloader] + extra_workers
+        run_state = {
+            'client_queue': queue.Queue(),
+            'lock': threading.Lock(),
+            'stop_event': threading.Event(),
+            'consecutive_errors': 0,
+            'error_summary': [],
+            'max_consecutive_errors': max_consecutive_errors,
+        }
         for client_info in client_list:
-            try:
-                logger.info(f"\n{'=' * 80}")
-                logger.info(f"Starting to process client: {client_info['client_name']} ({client_info['client_number']})")
-                logger.info(f"{'=' * 80}\n")
-                
-                # Delete all files in download_dir before processing new client
-                # (keep subdirectories like 0_csv_, 0_zip_)
-                clean_download_dir(downloader.download_dir)
-                
-                # Create client object
-                client_object = Client(client_info['client_name'], client_info['client_number'])
-                
-                # Perform search_client
-                downloader.search_client(client_object)
-                
-                # Initialize folders after client is successfully found
-                client_object.initialize_folders()
-                downloader.excel_handler.update_client_row(
-                    client_info['row_index'],
-                    status="InProgress",
-                    description="Downloading documents...",
-                    total_documents=client_object.max_total_documents,
-                    num_files_downloaded=client_object.get_number_of_downloaded_documents(),
-                    client_folder_path=client_object.client_folder_path
-                )
-
-                # Check number of documents
-                if client_object.max_total_documents == 0:
-                    logger.warning(f"Client {client_info['client_name']} has no documents")
-                    downloader.excel_handler.update_client_row(
-                        client_info['row_index'],
-                        status="Success",
-                        description="Client has no document",
-                        total_documents=0,
-                        num_files_downloaded=0,
-                        client_folder_path=client_object.client_folder_path
-                    )
-                    downloader.excel_handler.save_workbook()
-                    continue
-                
-                # Perform export_csv_file
-                downloader.export_csv_file(client_object)
-                # Perform export_documents
-                downloader.export_documents(client_object)
-                
-                # Update status to success
-                if client_object.get_number_of_downloaded_documents() == client_object.max_total_documents:
-                    c_status = "Success"
-                    c_description = "Download client documents successfully"
-                else:
-                    c_status = "Warning"
-                    c_description = "Download client documents with some errors"
-                    
-                downloader.excel_handler.update_client_row(
-                    client_info['row_index'],
-                    status=c_status,
-                    description=c_description,
-                    total_documents=client_object.max_total_documents,
-                    num_files_downloaded=client_object.get_number_of_downloaded_documents(),
-                    client_folder_path=client_object.client_folder_path
-                )
-                downloader.excel_handler.save_workbook()
-                
-                logger.info(f"Completed processing client: {client_info['client_name']}")
-                
-                # Reset consecutive errors on success
-                consecutive_errors = 0
-                error_summary = []
-                
-            except Exception as e:
-                error_msg = f"Error processing client {client_info['client_name']}: {str(e)}"
-                logger.error(error_msg)
-                logger.error(traceback.format_exc())
-                consecutive_errors += 1
-                error_summary.append({
-                    'client_name': client_info['client_name'],
-                    'client_number': client_info['client_number'],
-                    'error': error_msg
-                })
-                
-                downloader.excel_handler.update_client_row(
-                    client_info['row_index'],
-                    status="Error",
-                    description=error_msg,
-                    total_documents=client_object.max_total_documents,
-                    num_files_downloaded=client_object.get_number_of_downloaded_documents(),
-                    client_folder_path=client_object.client_folder_path
-                )
-                downloader.excel_handler.save_workbook()
-                
-                # Check consecutive errors
-                if consecutive_errors >= max_consecutive_errors:
-                    logger.critical(f"Found {consecutive_errors} consecutive client errors, stopping automation and sending email")
-                    if downloader.email_handler:
-                        downloader.email_handler.send_critical_error_email(consecutive_errors, {
-                            'total_errors': consecutive_errors,
-                            'errors': error_summary[-max_consecutive_errors:]
-                        })
-                    break
-                continue
+            run_state['client_queue'].put(client_info)
+        
+        if len(workers) == 1:
+            process_client_queue(downloader, run_state)
+        else:
+            logger.info(f"Processing clients with {len(workers)} Chrome instances in parallel")
+            with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+                for future in [executor.submit(process_client_queue, worker, run_state) for worker in workers]:
+                    future.result()
         
         logger.info(f"\n{'=' * 80}")
         logger.info(f"AUTOMATION COMPLETED")
@@ -1184,6 +1534,9 @@ def main():
             )
     finally:
         # Cleanup
+        for worker in extra_workers:
+            if worker.driver:
+                worker.driver.quit()
         if 'downloader' in locals() and downloader and downloader.driver:
             downloader.driver.quit()
             logger.info("Browser closed")
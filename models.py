@@ -4,11 +4,12 @@ Contains Document and Client classes to manage data using OOP
 """
 
 import os
-import re
 import logging
 import traceback
-from datetime import datetime
-from document_mapping import get_document_category
+from stat import S_ISDIR
+import time
+import threading
+from document_mapping import get_document_category, get_all_categories
 from utils import get_download_dir_from_env
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,119 @@ logger = logging.getLogger(__name__)
 # Global variable for base download directory (loaded from .env)
 BASE_DOWNLOAD_DIR = get_download_dir_from_env()
 
+# Category folder names never change at runtime, read once instead of per client
+_ALL_CATEGORIES = tuple(get_all_categories())
+
+# Characters not allowed in Windows file/folder names, removed in one str.translate pass
+_FORBIDDEN_FS_CHARS = str.maketrans('', '', '\\/:*?"<>|')
+
+# Folder path -> set of file names in it (os.path.normcase applied), read once per folder
+# so checking hundreds of documents costs one scandir instead of two stat calls each
+_folder_listing_cache = {}
+
+
+def _listdir_cached(folder_path):
+    """
+    Return the (normcased) file names in folder_path, scanning the folder only on first use
+    
+    Args:
+        folder_path (str): Folder path
+        
+    Returns:
+        set: File names in the folder (empty if the folder does not exist)
+    """
+    cache_key = os.path.normcase(folder_path)
+    file_names = _folder_listing_cache.get(cache_key)
+    if file_names is None:
+        try:
+            with os.scandir(folder_path) as entries:
+                file_names = {os.path.normcase(entry.name) for entry in entries if entry.is_file()}
+        except OSError:
+            file_names = set()
+        _folder_listing_cache[cache_key] = file_names
+    return file_names
+
+
+# Separators a folder path may already end with (altsep is "/" on Windows, None on POSIX)
+_PATH_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+
+
+def _join_path(folder_path, name):
+    """
+    Join a folder path and a relative name by string concatenation
+    (faster than os.path.join, which re-parses drive/separator semantics on every call)
+    Only for names that are not absolute paths: category names, years, sanitized file names
+    
+    Args:
+        folder_path (str): Folder path
+        name (str): Relative name to append
+        
+    Returns:
+        str: Joined path
+    """
+    if not folder_path or folder_path.endswith(_PATH_SEPARATORS):
+        return folder_path + name
+    return folder_path + os.sep + name
+
+
+def _is_dir(path):
+    """
+    Check that path exists and is a directory with a single stat call
+    (os.path.exists + os.path.isdir stat the path twice)
+    
+    Args:
+        path (str): Path to check
+        
+    Returns:
+        bool: True if path is an existing directory
+    """
+    try:
+        return S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def invalidate_folder_cache(folder_path):
+    """
+    Drop the cached listing of folder_path (call after files are written to it)
+    
+    Args:
+        folder_path (str): Folder path
+    """
+    _folder_listing_cache.pop(os.path.normcase(folder_path), None)
+
+
+class _cached_slot:
+    """
+    Lazy attribute for classes with __slots__ (functools.cached_property needs an instance __dict__)
+    The value is computed on first access and kept in slot "_cached_<name>", which the class must declare
+    """
+    
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+    
+    def __set_name__(self, owner, name):
+        self.slot_name = f"_cached_{name}"
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            # Unset slot raises AttributeError
+            return getattr(instance, self.slot_name)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot_name, value)
+            return value
+    
+    def reset(self, instance):
+        """Drop the cached value so it is computed again on next access"""
+        try:
+            delattr(instance, self.slot_name)
+        except AttributeError:
+            pass
+
 
 # Custom Exceptions
 class ModelError(Exception):
@@ -30,6 +144,18 @@ class FolderCreationError(ModelError):
 
 class Document:
     """Class to manage document information"""
+    # Thousands of instances per run: no per-instance __dict__, lazy values use "_cached_<name>" slots
+    __slots__ = (
+        'document_id', 'file_section', 'document_type', 'description', 'year',
+        'document_date', 'file_size', 'file_type', 'client_name', 'client_object',
+        'download_status', 'download_description', 'download_time', 'excel_row_index',
+        # Storage for the _cached_slot attributes below
+        '_cached_category_name', '_cached_document_name_without_id', '_cached_document_name_with_id',
+        '_cached_document_name_without_id_lower', '_cached_document_name_with_id_lower',
+        '_cached_document_folder_path', '_cached_document_file_path', '_cached_downloadable',
+        '_cached_file_exists', '_cached__year_stripped',
+    )
+    
     BE_DOWNLOAD_YEAR = 2018
     REDOWNLOAD_IF_EXISTS = True
     
@@ -63,27 +189,63 @@ class Document:
         self.client_name = client_name
         self.client_object = client_object
         
-        # Calculate category from file_section, document_type, description
-        self.category_name = self.get_document_category_name()
-        
         # Download status (default: "")
         self.download_status = ""  # "Success", "Error", "Warning", etc.
         self.download_description = ""
         self.download_time = ""
         
-        # Calculate document names
-        self.document_name_without_id = self._generate_document_name_without_id()
-        self.document_name_with_id = self._generate_document_name_with_id()
+        # Row index in document log sheet (set when the client's CSV is exported, None if not logged)
+        self.excel_row_index = None
         
-        # Calculate attributes dependent on client_object (may be None at initialization)
-        self.document_folder_path = self.get_document_folder_path()
+        # Category, names, paths, downloadable and file_exists are lazy attributes computed on first use
+        # (documents that are never checked or downloaded don't pay for the category lookup and folder scan)
+    
+    @_cached_slot
+    def category_name(self):
+        """Category name from file_section, document_type, description"""
+        return self.get_document_category_name()
+    
+    @_cached_slot
+    def document_name_without_id(self):
+        """Document name without _id at the end"""
+        return self._generate_document_name_without_id()
+    
+    @_cached_slot
+    def document_name_with_id(self):
+        """Document name with _id at the end"""
+        return self._generate_document_name_with_id()
+    
+    @_cached_slot
+    def document_name_without_id_lower(self):
+        """Lowercase document name without id, for case-insensitive file name checks"""
+        return self.document_name_without_id.lower()
+    
+    @_cached_slot
+    def document_name_with_id_lower(self):
+        """Lowercase document name with id, for case-insensitive file name checks"""
+        return self.document_name_with_id.lower()
+    
+    @_cached_slot
+    def document_folder_path(self):
+        """Document folder path (depends on client_object, reset by update_paths)"""
+        return self.get_document_folder_path()
+    
+    @_cached_slot
+    def document_file_path(self):
+        """Document file path, empty if folder path is not available (reset by update_paths)"""
         if self.document_folder_path:
-            self.document_file_path = os.path.join(self.document_folder_path, self.document_name_with_id)
-        else:
-            self.document_file_path = ""
-        
-        self.downloadable = self.is_downloadable()
-        self.file_exists = self.check_file_exists()
+            return _join_path(self.document_folder_path, self.document_name_with_id)
+        return ""
+    
+    @_cached_slot
+    def downloadable(self):
+        """Whether the document year allows downloading"""
+        return self.is_downloadable()
+    
+    @_cached_slot
+    def file_exists(self):
+        """Whether the document file already exists (reset by update_paths)"""
+        return self.check_file_exists()
 
     def be_executed(self):
         """
@@ -94,11 +256,11 @@ class Document:
         """
         if not self.downloadable:
             return False
-        # If file does not exist, can download
-        if not self.file_exists:
+        # Redownload allowed: existence doesn't matter, skip the file check
+        if self.REDOWNLOAD_IF_EXISTS:
             return True
-        # If file already exists, only download if REDOWNLOAD_IF_EXISTS = True
-        return self.REDOWNLOAD_IF_EXISTS
+        # File exists is only checked here (file_exists is computed on first access)
+        return not self.file_exists
     
     def is_downloadable(self):
         """
@@ -120,19 +282,9 @@ class Document:
         Generate document name without _id at the end
         Format: ClientName_Year_DocumentType_Description.ext
         """
-        name_items = []
-        if self.client_name:
-            name_items.append(str(self.client_name))
-        if self.year:
-            name_items.append(str(self.year))
-        if self.document_type:
-            name_items.append(str(self.document_type))
-        if self.description:
-            name_items.append(str(self.description))
-        
-        name = "_".join(name_items)
-        # Remove special characters
-        name = re.sub(r'[\\/:*?"<>|]', '', name)
+        name_items = (self.client_name, self.year, self.document_type, self.description)
+        # Join non-empty items and remove special characters in one translate pass
+        name = "_".join([str(item) for item in name_items if item]).translate(_FORBIDDEN_FS_CHARS)
         file_type = self.file_type or "pdf"
         return f"{name}.{file_type}"
     
@@ -141,8 +293,12 @@ class Document:
         Generate document name with _id at the end
         Format: ClientName_Year_DocumentType_Description_document_id.ext
         """
-        base_name, ext = os.path.splitext(self.document_name_without_id)
-        return f"{base_name}_{self.document_id}{ext}"
+        # Name without id always ends with ".{file_type}", so the last dot splits off the extension
+        name = self.document_name_without_id
+        dot_index = name.rfind('.')
+        if dot_index < 0:
+            return f"{name}_{self.document_id}"
+        return f"{name[:dot_index]}_{self.document_id}{name[dot_index:]}"
     
     def get_document_category_name(self):
         """
@@ -163,12 +319,16 @@ class Document:
             description (str): Download description
             download_time (str): Download time (format: "YYYY-MM-DD HH:MM:SS")
         """
+        previous_status = self.download_status
         self.download_status = status
         self.download_description = description
+        # Keep the client's success counter in sync
+        if self.client_object is not None and (previous_status == "Success") != (status == "Success"):
+            self.client_object._on_document_success_changed(self, status == "Success")
         if download_time:
             self.download_time = download_time
         else:
-            self.download_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.download_time = time.strftime("%Y-%m-%d %H:%M:%S")
     
     def set_download_description(self, description):
         """
@@ -188,7 +348,7 @@ class Document:
         """
         if not self.document_file_path:
             return False
-        return os.path.exists(self.document_file_path) and os.path.isfile(self.document_file_path)
+        return os.path.normcase(self.document_name_with_id) in _listdir_cached(self.document_folder_path)
     
     def get_document_folder_path(self):
         """
@@ -212,30 +372,37 @@ class Document:
         if not category_name:
             return ""
         
-        # Create path
-        if self.year and self.year.strip():
-            # Has year: client_folder_path/category_name/year
-            return os.path.join(client_folder_path, category_name, self.year.strip())
-        else:
-            # No year: client_folder_path/category_name
-            return os.path.join(client_folder_path, category_name)
+        # Create path (shared by all documents of the client with same category and year)
+        return self.client_object.get_document_folder_path(category_name, self._year_stripped)
+    
+    @_cached_slot
+    def _year_stripped(self):
+        """Year without surrounding whitespace, empty if no year"""
+        return self.year.strip() if self.year else ""
     
     def update_paths(self):
         """
         Update paths when client_object is set or changed
         Should call this method after document is added to client
         """
-        self.document_folder_path = self.get_document_folder_path()
-        if self.document_folder_path:
-            self.document_file_path = os.path.join(self.document_folder_path, self.document_name_with_id)
-        else:
-            self.document_file_path = ""
-        # Update file_exists
-        self.file_exists = self.check_file_exists()
+        # Nothing computed yet or folder unchanged: keep cached values (no repeated existence check)
+        cached_folder_path = getattr(self, '_cached_document_folder_path', None)
+        if cached_folder_path is None or cached_folder_path == self.get_document_folder_path():
+            return
+        
+        # Drop cached values so they are computed again from the current client_object
+        for lazy_attribute in (Document.document_folder_path, Document.document_file_path, Document.file_exists):
+            lazy_attribute.reset(self)
 
 
 class Client:
     """Class to manage client information and documents"""
+    __slots__ = (
+        'client_name', 'client_number', 'client_folder_name', 'client_folder_path',
+        'document_list', '_document_index', 'download_client_status',
+        'download_client_description', 'max_total_documents', 'csv_download_file_path',
+        '_folder_path_cache', '_success_count', '_success_count_lock',
+    )
     
     def __init__(self, client_name, client_number):
         """
@@ -258,6 +425,14 @@ class Client:
         
         # Document list
         self.document_list = []
+        # document_id -> Document, kept in sync with document_list for O(1) duplicate checks
+        self._document_index = {}
+        # Number of documents with download_status = "Success", updated by Document.set_download_status
+        # (statuses may be set from the zip worker thread, so updates take a lock)
+        self._success_count = 0
+        self._success_count_lock = threading.Lock()
+        # (client_folder_path, category, year) -> document folder path, shared by documents of the client
+        self._folder_path_cache = {}
         
         # Download status
         self.download_client_status = ""
@@ -267,7 +442,8 @@ class Client:
         # CSV download file path
         self.csv_download_file_path = ""
     
-    def _sanitize_folder_name(self, folder_name):
+    @staticmethod
+    def _sanitize_folder_name(folder_name):
         """
         Validate and format folder name to ensure safety for file system
         
@@ -279,19 +455,7 @@ class Client:
         """
         if not folder_name:
             return ""
-        
-        sanitized = (str(folder_name)
-                    .replace("/", "")
-                    .replace("\\", "")
-                    .replace(":", "")
-                    .replace("*", "")
-                    .replace('?', "")
-                    .replace('"', "")
-                    .replace('<', "")
-                    .replace('>', "")
-                    .replace('|', ""))
-        
-        return sanitized
+        return str(folder_name).translate(_FORBIDDEN_FS_CHARS)
     
     def add_document(self, document):
         """
@@ -302,19 +466,32 @@ class Client:
             document (Document): Document object
         """
         # Check if document with same document_id already exists
-        existing_doc = None
-        for doc in self.document_list:
-            if doc.document_id == document.document_id:
-                existing_doc = doc
-                break
+        if document.document_id in self._document_index:
+            return
         
         # If not exists, add new
-        if existing_doc is None:
-            self.document_list.append(document)
-            # Set client_object reference for document
-            document.client_object = self
-            # Update document paths
-            document.update_paths()
+        self._document_index[document.document_id] = document
+        self.document_list.append(document)
+        # Set client_object reference for document
+        document.client_object = self
+        # Update document paths
+        document.update_paths()
+        if document.download_status == "Success":
+            self._on_document_success_changed(document, True)
+    
+    def _on_document_success_changed(self, document, is_success):
+        """
+        Update success counter when a document enters or leaves "Success" status
+        
+        Args:
+            document (Document): Document whose status changed
+            is_success (bool): True if document is now "Success", False if it no longer is
+        """
+        # Only documents in document_list are counted (a duplicate may still reference this client)
+        if self._document_index.get(document.document_id) is not document:
+            return
+        with self._success_count_lock:
+            self._success_count += 1 if is_success else -1
     
     def get_number_of_downloaded_documents(self):
         """
@@ -323,7 +500,7 @@ class Client:
         Returns:
             int: Number of documents with download_status = "Success"
         """
-        return sum(1 for doc in self.document_list if doc.download_status == "Success")
+        return self._success_count
     
     def set_client_status(self, status):
         """
@@ -343,6 +520,27 @@ class Client:
         """
         self.download_client_description = description
     
+    def get_document_folder_path(self, category, year=""):
+        """
+        Return document folder path for category and year (built once per combination)
+        
+        Args:
+            category (str): Category name
+            year (str): Stripped year (optional)
+            
+        Returns:
+            str: client_folder_path/category, or client_folder_path/category/year if year is not empty
+        """
+        # client_folder_path is part of the key so the cache stays valid if the folder changes
+        cache_key = (self.client_folder_path, category, year)
+        folder_path = self._folder_path_cache.get(cache_key)
+        if folder_path is None:
+            folder_path = _join_path(self.client_folder_path, category)
+            if year:
+                folder_path = _join_path(folder_path, year)
+            self._folder_path_cache[cache_key] = folder_path
+        return folder_path
+    
     def check_client_folder_exists(self):
         """
         Check if client folder already exists
@@ -352,7 +550,7 @@ class Client:
         """
         if not self.client_folder_path:
             return False
-        return os.path.exists(self.client_folder_path) and os.path.isdir(self.client_folder_path)
+        return _is_dir(self.client_folder_path)
     
     def check_category_folder_exists(self, category):
         """
@@ -366,8 +564,8 @@ class Client:
         """
         if not self.client_folder_path:
             return False
-        category_path = os.path.join(self.client_folder_path, category)
-        return os.path.exists(category_path) and os.path.isdir(category_path)
+        category_path = _join_path(self.client_folder_path, category)
+        return _is_dir(category_path)
     
     def check_year_folder_exists(self, category, year):
         """
@@ -382,8 +580,8 @@ class Client:
         """
         if not self.client_folder_path or not year:
             return False
-        year_path = os.path.join(self.client_folder_path, category, year)
-        return os.path.exists(year_path) and os.path.isdir(year_path)
+        year_path = _join_path(_join_path(self.client_folder_path, category), year)
+        return _is_dir(year_path)
     
     def create_client_folder(self):
         """
@@ -429,19 +627,25 @@ class Client:
         Raises:
             FolderCreationError: If there is an error creating category folders
         """
-        if not self.client_folder_path or not os.path.exists(self.client_folder_path):
+        if not self.client_folder_path or not _is_dir(self.client_folder_path):
             error_msg = f"Client folder does not exist: {self.client_folder_path}"
             logger.error(error_msg)
             raise FolderCreationError(error_msg)
         
         try:
-            from document_mapping import get_all_categories
-            categories = get_all_categories()
+            # One listing of the client folder instead of a stat per category
+            with os.scandir(self.client_folder_path) as entries:
+                existing_dirs = {os.path.normcase(entry.name) for entry in entries if entry.is_dir()}
             
-            for category in categories:
-                category_path = os.path.join(self.client_folder_path, category)
-                if not os.path.exists(category_path):
-                    os.makedirs(category_path, exist_ok=True)
+            for category in _ALL_CATEGORIES:
+                if os.path.normcase(category) in existing_dirs:
+                    continue
+                # Parent is known to exist, so a plain mkdir is enough
+                category_path = _join_path(self.client_folder_path, category)
+                try:
+                    os.mkdir(category_path)
+                except FileExistsError:
+                    pass
             
             logger.debug(f"Created category folders for client: {self.client_name}")
             
@@ -501,17 +705,17 @@ class Client:
             logger.error(error_msg)
             raise FolderCreationError(error_msg)
         
-        if not os.path.exists(self.client_folder_path):
+        if not _is_dir(self.client_folder_path):
             error_msg = f"Client folder does not exist: {self.client_folder_path}"
             logger.error(error_msg)
             raise FolderCreationError(error_msg)
         
         try:
-            category_path = os.path.join(self.client_folder_path, category)
+            category_path = _join_path(self.client_folder_path, category)
             if not os.path.exists(category_path):
                 os.makedirs(category_path, exist_ok=True)
             
-            year_path = os.path.join(category_path, year)
+            year_path = _join_path(category_path, year)
             if not os.path.exists(year_path):
                 os.makedirs(year_path, exist_ok=True)
             
@@ -6,11 +6,10 @@ folder_path = r"C:\Users\gfr-admin\Savant Capital, LLC\Karbon - Documents"
 
 # Kiểm tra thư mục có tồn tại không
 if os.path.exists(folder_path):
-    # Lấy danh sách các item trong thư mục
-    items = os.listdir(folder_path)
-    
-    # Lọc chỉ lấy các thư mục (folder), không lấy file
-    folders = [item for item in items if os.path.isdir(os.path.join(folder_path, item))]
+    # Lấy danh sách các item trong thư mục và lọc chỉ lấy các thư mục (folder), không lấy file
+    # (scandir trả về loại entry cùng lúc, không cần gọi isdir cho từng item)
+    with os.scandir(folder_path) as entries:
+        folders = [entry.name for entry in entries if entry.is_dir()]
     
     # Sắp xếp theo tên (tùy chọn)
     folders.sort()
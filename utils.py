@@ -4,11 +4,18 @@ Chứa các hàm tiện ích chung
 """
 
 import os
+import re
 import sys
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Một dòng KEY=VALUE của .env (bỏ qua dòng trống, comment #, dòng không có "=")
+ENV_LINE_PATTERN = re.compile(r'^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+
+# Cấu hình đã parse từ .env (None nếu chưa đọc thành công lần nào)
+_env_config_cache = None
+
 
 def resource_path(relative_path):
     """
@@ -64,6 +71,12 @@ def load_env_config(raise_on_not_found=False):
     Returns:
         dict: Dictionary chứa các key-value từ .env, rỗng nếu không tìm thấy hoặc có lỗi
     """
+    global _env_config_cache
+    
+    # .env chỉ parse một lần, các lần gọi sau trả về bản copy (caller có thể sửa dict)
+    if _env_config_cache is not None:
+        return dict(_env_config_cache)
+    
     config_dict = {}
     
     try:
@@ -78,15 +91,15 @@ def load_env_config(raise_on_not_found=False):
                 logger.warning(error_msg)
                 return config_dict
         
+        # Đọc cả file rồi parse bằng một lượt regex (không strip/split từng dòng bằng Python)
         with open(env_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    config_dict[key.strip()] = value.strip()
+            env_text = f.read()
+        for match in ENV_LINE_PATTERN.finditer(env_text):
+            config_dict[match.group(1)] = match.group(2)
         
         logger.info(f"Đã load config từ .env: {list(config_dict.keys())}")
-        return config_dict
+        _env_config_cache = config_dict
+        return dict(config_dict)
         
     except Exception as e:
         error_msg = f"Lỗi khi đọc file .env: {str(e)}"